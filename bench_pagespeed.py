@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Benchmark PageSpeed response size: full lighthouseResult vs fields= projection vs compact per-URL record.
+
+Приклад:
+    python3 bench_pagespeed.py --key $PAGESPEED_API_KEY --urls https://example.com https://example.com/catalog \\
+        --save ps_responses --out bench_pagespeed.json
+    python3 bench_pagespeed.py --from-dir ps_responses
+
+Проєкція fields= береться з вузла PageSpeed Run у PageSpeed_Test.json, тож
+бенчмарк міряє саме те, що запитує воркфлоу. Онлайн-режим робить по два
+запити на URL і стратегію (повна відповідь і з fields=); --from-dir бере
+збережені повні відповіді і застосовує ту саму проєкцію локально.
+Пам'ять на URL - пік tracemalloc під час json.loads (об'єкти, які n8n тримає
+як item) плюс розмір JSON, що потрапляє в дані виконання.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import urllib.parse
+
+from bench_workflows import ROOT, request
+
+ENDPOINT = 'https://www.googleapis.com/pagespeedonline/v5/runPagespeed'
+CATEGORIES = ['performance', 'accessibility', 'best-practices', 'seo']
+METRIC_AUDITS = {
+    'fcpDisplay': 'first-contentful-paint',
+    'lcpDisplay': 'largest-contentful-paint',
+    'tbtDisplay': 'total-blocking-time',
+    'clsDisplay': 'cumulative-layout-shift',
+    'speedIndexDisplay': 'speed-index',
+    'ttiDisplay': 'interactive',
+}
+NAME_RE = re.compile(r'[\w.*-]+')
+
+
+def workflow_fields():
+    """fields= з вузла PageSpeed Run (encodeURIComponent('...') у виразі URL)."""
+    with open(os.path.join(ROOT, 'PageSpeed_Test.json'), encoding='utf-8') as f:
+        wf = json.load(f)
+    url = next(n for n in wf['nodes'] if n['name'] == 'PageSpeed Run')['parameters']['url']
+    m = re.search(r"fields=\{\{ encodeURIComponent\('([^']+)'\) \}\}", url)
+    if not m:
+        raise SystemExit('PageSpeed Run: fields= не знайдено в URL')
+    return m.group(1)
+
+
+# ── Проєкція fields= (синтаксис partial response Google API) ──
+def parse_fields(spec):
+    """'a(b/*/c,d)' -> {'a': {'b': {'*': {'c': None}}, 'd': None}}; None - поле цілком."""
+    tree, pos = _parse_list(spec, 0)
+    if pos != len(spec):
+        raise ValueError(f'fields: зайвий символ на позиції {pos}: {spec[pos:]!r}')
+    return tree
+
+
+def _parse_list(spec, pos):
+    tree = {}
+    while True:
+        path = []
+        while True:
+            m = NAME_RE.match(spec, pos)
+            if not m:
+                raise ValueError(f'fields: очікується назва поля на позиції {pos}')
+            path.append(m.group())
+            pos = m.end()
+            if not spec.startswith('/', pos):
+                break
+            pos += 1
+        sub = None
+        if spec.startswith('(', pos):
+            sub, pos = _parse_list(spec, pos + 1)
+            if not spec.startswith(')', pos):
+                raise ValueError(f'fields: очікується ")" на позиції {pos}')
+            pos += 1
+        node = tree
+        for name in path[:-1]:
+            node = node.setdefault(name, {})
+        node[path[-1]] = sub
+        if not spec.startswith(',', pos):
+            return tree, pos
+        pos += 1
+
+
+def project(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, sub in tree.items():
+        keys = value.keys() if key == '*' else [key] if key in value else []
+        for k in keys:
+            out[k] = project(value[k], sub)
+    return out
+
+
+# ── Компактний запис: те саме, що Compact Responses у воркфлоу ──
+def compact_record(body):
+    lighthouse = body.get('lighthouseResult') or {}
+    audits = lighthouse.get('audits') or {}
+    categories = lighthouse.get('categories') or {}
+    record = {
+        ('bestPractices' if c == 'best-practices' else c): round(((categories.get(c) or {}).get('score') or 0) * 100)
+        for c in CATEGORIES
+    }
+    for key, audit in METRIC_AUDITS.items():
+        record[key] = (audits.get(audit) or {}).get('displayValue') or 'N/A'
+    record['recommendations'] = [
+        a.get('title') for a in audits.values()
+        if a.get('score') is not None and a['score'] < 0.9 and (a.get('details') or {}).get('type') == 'opportunity'
+    ][:5]
+    return record
+
+
+# ── Заміри ──
+def parsed_peak(raw):
+    """Пік пам'яті Python-об'єктів при розборі JSON (байти)."""
+    tracemalloc.start()
+    obj = json.loads(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return peak
+
+
+def measure(full_raw, projected_raw):
+    full = json.loads(full_raw)
+    compact = json.dumps(compact_record(full), ensure_ascii=False).encode()
+    projected_check = compact_record(json.loads(projected_raw))
+    return {
+        'full_bytes': len(full_raw),
+        'full_parsed': parsed_peak(full_raw),
+        'projected_bytes': len(projected_raw),
+        'projected_parsed': parsed_peak(projected_raw),
+        'compact_bytes': len(compact),
+        # Проєкція не має втрачати жодного поля, яке читає воркфлоу
+        'same_record': projected_check == compact_record(full),
+    }
+
+
+def fetch(args, url, strategy, fields=None):
+    query = [('url', url), ('strategy', strategy)] + [('category', c) for c in CATEGORIES]
+    if fields:
+        query.append(('fields', fields))
+    query.append(('key', args.key))
+    t0 = time.perf_counter()
+    body = request('GET', ENDPOINT + '?' + urllib.parse.urlencode(query), timeout=180)
+    ms = (time.perf_counter() - t0) * 1000
+    if not isinstance(body, dict) or 'lighthouseResult' not in body:
+        raise RuntimeError(f'{url} ({strategy}): {str(body)[:200]}')
+    return json.dumps(body, ensure_ascii=False).encode(), ms
+
+
+def load_samples(args, fields):
+    """(назва, повна відповідь, проєкція) для кожного URL і стратегії."""
+    tree = parse_fields(fields)
+    if args.from_dir:
+        for path in sorted(glob.glob(os.path.join(args.from_dir, '*.json'))):
+            with open(path, 'rb') as f:
+                raw = f.read()
+            projected = json.dumps(project(json.loads(raw), tree), ensure_ascii=False).encode()
+            yield os.path.basename(path), raw, projected
+        return
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+    for url in args.urls:
+        for strategy in args.strategies:
+            full, full_ms = fetch(args, url, strategy)
+            projected, projected_ms = fetch(args, url, strategy, fields)
+            print(f'  {url} ({strategy}): {full_ms:.0f} ms повна, {projected_ms:.0f} ms з fields=')
+            if args.save:
+                name = re.sub(r'\W+', '_', urllib.parse.urlsplit(url).netloc + urllib.parse.urlsplit(url).path).strip('_')
+                with open(os.path.join(args.save, f'{name}_{strategy}.json'), 'wb') as f:
+                    f.write(full)
+            yield f'{url} ({strategy})', full, projected
+
+
+def kb(n):
+    return f'{n / 1024:,.1f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--key', default=os.environ.get('PAGESPEED_API_KEY', ''))
+    parser.add_argument('--urls', nargs='+', default=[])
+    parser.add_argument('--strategies', nargs='+', default=['mobile', 'desktop'])
+    parser.add_argument('--from-dir', help='папка зі збереженими повними відповідями (*.json)')
+    parser.add_argument('--save', help='зберегти повні відповіді для повторних офлайн-замірів')
+    parser.add_argument('--out', help='зберегти результат у JSON')
+    args = parser.parse_args()
+
+    if not args.from_dir and not (args.urls and args.key):
+        parser.error('потрібні --urls і --key (або PAGESPEED_API_KEY), або --from-dir')
+
+    fields = workflow_fields()
+    print(f'fields={fields}\n')
+    results = []
+    for name, full, projected in load_samples(args, fields):
+        r = {'sample': name, **measure(full, projected)}
+        results.append(r)
+
+    if not results:
+        sys.exit('немає відповідей для заміру')
+
+    print(f"  {'відповідь':<45} {'повна KB':>10} {'у пам. KB':>10} {'fields KB':>10} {'у пам. KB':>10} {'запис B':>8}")
+    for r in results:
+        print(f"  {r['sample'][:45]:<45} {kb(r['full_bytes']):>10} {kb(r['full_parsed']):>10} "
+              f"{kb(r['projected_bytes']):>10} {kb(r['projected_parsed']):>10} {r['compact_bytes']:>8}"
+              + ('' if r['same_record'] else '  ! запис відрізняється'))
+
+    full_mem = statistics.median(r['full_parsed'] for r in results)
+    projected_mem = statistics.median(r['projected_parsed'] for r in results)
+    print(f"\n  Медіана на відповідь: {kb(full_mem)} KB -> {kb(projected_mem)} KB у пам'яті "
+          f"(x{full_mem / max(projected_mem, 1):.0f}), компактний запис "
+          f"{statistics.median(r['compact_bytes'] for r in results):.0f} B")
+    if not all(r['same_record'] for r in results):
+        print('  УВАГА: проєкція fields= втрачає поля, які читає Compact Responses', file=sys.stderr)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'fields': fields, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f'\nЗбережено: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark DocBuilder tables: per-cell add_table vs add_bulk_table on keyword-sized tables.
+
+Приклад:
+    python3 bench_tables.py --rows 100 1000 --out bench_tables.json
+
+Дані - синтетичні рядки у форматі листа Ключові_фрази (6 колонок, як експорт
+Serpstat / GKP). Пікова пам'ять - приріст піку RSS (VmHWM, Linux) у свіжому
+spawn-процесі: lxml виділяє пам'ять поза Python, tracemalloc її не бачить.
+add_table на великих таблицях квадратичний (table.rows[i] щоразу обходить
+XML) - 10 000 рядків через нього йдуть десятки хвилин, тому за замовч. їх
+немає.
+"""
+
+import argparse
+import gc
+import io
+import json
+import multiprocessing
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from report_renderer import DocBuilder
+
+HEADERS = ['Ключова фраза', 'Частотність', 'Позиція', 'URL', 'Трафік', 'Інтент']
+COL_WIDTHS = [5, 2, 1.5, 5, 2, 2]
+INTENTS = ['informational', 'commercial', 'transactional', 'navigational']
+
+METHODS = {
+    'add_table': lambda b, rows: b.add_table(HEADERS, rows, COL_WIDTHS, bulk=False),
+    'add_bulk_table': lambda b, rows: b.add_bulk_table(HEADERS, rows, COL_WIDTHS),
+}
+
+
+def make_rows(n, seed=42):
+    rnd = random.Random(seed)
+    return [[
+        f'купити товар {i} київ ціна',
+        rnd.randint(10, 50000),
+        rnd.randint(1, 100),
+        f'https://example.com/catalog/item-{i}',
+        round(rnd.random() * 500, 1),
+        rnd.choice(INTENTS),
+    ] for i in range(n)]
+
+
+def run_once(method, rows):
+    builder = DocBuilder()
+    t0 = time.perf_counter()
+    METHODS[method](builder, rows)
+    t1 = time.perf_counter()
+    builder.doc.save(io.BytesIO())
+    t2 = time.perf_counter()
+    return (t1 - t0) * 1000, (t2 - t1) * 1000
+
+
+def _rss_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def _peak_rss(method, n):
+    rows = make_rows(n)
+    builder = DocBuilder()
+    gc.collect()
+    # Пік, набраний під час імпортів, інакше перекриває замір: скидаємо VmHWM до поточного RSS
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    before = _rss_kb('VmRSS')
+    METHODS[method](builder, rows)
+    return (_rss_kb('VmHWM') - before) * 1024
+
+
+def peak_memory(method, n):
+    # Свіжий процес на кожен замір - max RSS не скидається. Лише spawn: fork успадкував би
+    # пік батька після run_once, і приріст у дитини був би нульовим
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_peak_rss, method, n).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help='не міряти пікову пам\'ять')
+    parser.add_argument('--out', help='зберегти результат у JSON')
+    args = parser.parse_args()
+
+    results = []
+    print(f"  {'рядків':>7} {'метод':<15} {'build ms':>10} {'save ms':>10} {'peak MB':>9}")
+    for n in args.rows:
+        rows = make_rows(n)
+        for method in METHODS:
+            runs = [run_once(method, rows) for _ in range(args.repeat)]
+            peak = None if args.no_memory else peak_memory(method, n)
+            r = {
+                'rows': n,
+                'method': method,
+                'build_ms': round(statistics.median(b for b, _ in runs), 1),
+                'save_ms': round(statistics.median(s for _, s in runs), 1),
+                'peak_mb': round(peak / 1024 / 1024, 1) if peak is not None else None,
+            }
+            results.append(r)
+            print(f"  {n:>7} {method:<15} {r['build_ms']:>10} {r['save_ms']:>10} {r['peak_mb'] if peak is not None else '-':>9}")
+        base, bulk = results[-2], results[-1]
+        print(f"  {'':>7} прискорення побудови: x{base['build_ms'] / max(bulk['build_ms'], 0.1):.1f}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f'\nЗбережено: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
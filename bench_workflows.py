@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""Benchmark n8n workflows: fire a webhook, profile the execution per node, compare with a baseline.
+
+Приклад:
+    N8N_API_KEY=... python3 bench_workflows.py pagespeed-test \\
+        --base http://localhost:5678 --payload '{"spreadsheetId": "1AbC..."}' \\
+        --runs 3 --out bench_pagespeed.json --baseline bench_pagespeed_prev.json
+
+Час по вузлах береться з даних виконання (n8n public API, includeData=true),
+пікова пам'ять - з /metrics (n8n з N8N_METRICS=true). Воркфлоу звертаються
+до продакшн-хостів API напряму, тому без mock бенчмарк ганяє реальні виклики -
+використовуйте тестові домени/таблиці.
+
+Локальний mock upstream API (затримка, ліміт запитів, розмір відповіді):
+    python3 bench_workflows.py seo-audit-full-v74 --mock-export /tmp/bench-mock \
+        --mock-url http://bench-host:8787 --base http://bench-n8n:5678
+    # імпортуйте всі файли з /tmp/bench-mock у тестовий n8n, далі:
+    python3 bench_workflows.py seo-audit-full-v74 --mock --mock-latency 800 --mock-rate 2 --mock-rows 2000
+
+--mock-export пише копії воркфлоу сценарію і всіх, які він викликає (executeWorkflow і
+внутрішні webhook, транзитивно): HTTP-хости API (MOCK_HOSTS) замінені на <mock-url>/<хост>,
+внутрішні webhook (N8N_HOST) - на --base тестового n8n. Час вузлів викликаних воркфлоу
+входить у профіль як "<воркфлоу> / <вузол>". Ahrefs MCP
+mock відповідає по Streamable HTTP (JSON-RPC: initialize, tools/list, tools/call);
+нативні вузли Google Sheets / Drive / OpenAI ходять у Google / OpenAI і з mock.
+"""
+
+import argparse
+import collections
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# ── Сценарії: webhook, файл воркфлоу, одиниця пропускної здатності ──
+# units: (вузол, функція від json першого item) -> кількість оброблених одиниць;
+# вузол має виконуватись у тому ж виконанні, що й webhook сценарію
+SCENARIOS = {
+    'analiz-domenu': {
+        'file': 'Analiz_Domenu_Master.json',
+        'unit': 'domains/hour',
+        'units': ('Plan Jobs', lambda j: 1),
+        'payload': {'manager_email': 'bench@example.com', 'client_domain': 'example.com'},
+    },
+    # seo-organic-traffic-v74 лише запускає Browse AI: аудит продовжують callback і
+    # seo-audit-full-v74 в інших виконаннях, тож міряємо синхронний Full Audit
+    'seo-audit-full-v74': {
+        'file': 'Sheet 8 - Traffic Pages Nodes (1).json',
+        'unit': 'domains/hour',
+        'units': ('Respond - Full Audit Done', lambda j: 1),
+        'payload': {'domain': 'example.com', 'spreadsheetId': ''},
+    },
+    'gkp-ideas': {
+        'file': 'GKP_Universal_System.json',
+        'unit': 'keywords/min',
+        'units': ('Ideas - Format Data', lambda j: j.get('totalKeywords', 0)),
+        'payload': {'doc_name': 'Bench Ideas', 'source_spreadsheet_id': ''},
+    },
+    'gkp-metrics': {
+        'file': 'GKP_Universal_System.json',
+        'unit': 'keywords/min',
+        'units': ('Metrics - Parse Sheet', lambda j: len(j.get('keywords', []))),
+        'payload': {'doc_name': 'Bench Metrics', 'source_spreadsheet_id': ''},
+    },
+    'pagespeed-test': {
+        'file': 'PageSpeed_Test.json',
+        'unit': 'URLs/hour',
+        'units': ('Parse URLs', lambda j: j.get('totalUrls', 0)),
+        'payload': {'spreadsheetId': '', 'testMobile': True, 'testDesktop': True},
+    },
+    'parse-pdf-audit': {
+        'file': 'PDF_Audit_Parser.json',
+        'unit': 'documents/hour',
+        'units': (None, lambda j: 1),
+        'payload': {'pdfUrl': ''},
+    },
+}
+
+PER_HOUR = {'domains/hour': 3600, 'URLs/hour': 3600, 'documents/hour': 3600, 'keywords/min': 60}
+
+# Регресія вузла: повільніше на REGRESSION_RATIO і щонайменше на REGRESSION_MIN_MS
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_MS = 1000
+
+
+# ── HTTP ──
+def request(method, url, body=None, headers=None, timeout=60):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    if data is not None:
+        req.add_header('Content-Type', 'application/json')
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        raw = resp.read().decode()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def api(args, path):
+    return request('GET', args.base.rstrip('/') + '/api/v1/' + path,
+                   headers={'X-N8N-API-KEY': args.api_key, 'Accept': 'application/json'})
+
+
+def load_workflow(file):
+    with open(os.path.join(ROOT, file), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_workflow_id(args, file):
+    """ID з JSON-файлу; файли без id (експорт без метаданих) шукаємо в n8n за назвою."""
+    wf = load_workflow(file)
+    if wf.get('id'):
+        return wf['id']
+    name = wf.get('name', '')
+    listing = api(args, 'workflows?' + urllib.parse.urlencode({'name': name, 'limit': 250}))
+    matches = [w['id'] for w in listing.get('data', []) if w.get('name') == name]
+    if len(matches) != 1:
+        raise SystemExit(f'{file}: немає id, а за назвою "{name}" знайдено воркфлоу: {len(matches)} - '
+                         f'вкажіть --workflow-id')
+    return matches[0]
+
+
+# ── Mock upstream API ──
+# Хости, які --mock-export переводить на mock: <mock-url>/<хост>/<шлях>
+MOCK_HOSTS = (
+    'api.ahrefs.com', 'api.serpstat.com', 'api.openai.com', 'googleads.googleapis.com',
+    'www.googleapis.com', 'sheets.googleapis.com', 'docs.googleapis.com',
+    'api.browse.ai', 'api.cloudinary.com', 'pro.similarweb.com',
+)
+GOOGLE_ADS_PAGE = 1000
+
+
+# Продакшн n8n: воркфлоу викликають один одного webhook-ами на цей хост
+N8N_HOST = 'n8n.rnd.webpromo.tools'
+INTERNAL_WEBHOOK = re.compile(r'https://' + re.escape(N8N_HOST) + r'/webhook/([\w.-]+)')
+QUOTED_PATH = re.compile(r"'([\w.-]+)'")
+
+
+def repo_workflows():
+    """Файл -> JSON для всіх воркфлоу репозиторію."""
+    workflows = {}
+    for name in sorted(os.listdir(ROOT)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            wf = load_workflow(name)
+        except ValueError:
+            continue
+        if isinstance(wf, dict) and isinstance(wf.get('nodes'), list):
+            workflows[name] = wf
+    return workflows
+
+
+def called_workflows(file):
+    """Файли воркфлоу, які викликає file через executeWorkflow або внутрішні webhook, транзитивно."""
+    workflows = repo_workflows()
+    by_id, by_name, by_path = {}, {}, {}
+    for name, wf in workflows.items():
+        by_id[wf.get('id')] = by_name[wf.get('name')] = name
+        for node in wf['nodes']:
+            if node.get('type') == 'n8n-nodes-base.webhook':
+                by_path[node.get('parameters', {}).get('path')] = name
+
+    seen, queue = {file}, [file]
+    while queue:
+        for node in workflows[queue.pop(0)]['nodes']:
+            params = node.get('parameters', {})
+            text = json.dumps(params, ensure_ascii=False)
+            targets = [by_path.get(path) for path in INTERNAL_WEBHOOK.findall(text)]
+            if N8N_HOST + '/webhook/' in text:
+                # Code-вузли складають URL з бази: base + 'seo-organic-traffic-v74'
+                targets += [by_path.get(path) for path in QUOTED_PATH.findall(text)]
+            if node.get('type') == 'n8n-nodes-base.executeWorkflow':
+                ref = params.get('workflowId')
+                if isinstance(ref, dict):
+                    targets.append(by_id.get(ref.get('value')) or by_name.get(ref.get('cachedResultName')))
+                else:
+                    targets.append(by_id.get(ref))
+            for target in targets:
+                if target and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+    seen.discard(file)
+    return sorted(seen)
+
+
+def export_mock_workflows(scenario, mock_url, n8n_url, out_dir):
+    """Копії воркфлоу сценарію і викликаних ним: API-хости на mock, внутрішні webhook на тестовий n8n."""
+    os.makedirs(out_dir, exist_ok=True)
+    files = [scenario['file']] + called_workflows(scenario['file'])
+    for file in files:
+        with open(os.path.join(ROOT, file), encoding='utf-8') as f:
+            text = f.read()
+        for host in MOCK_HOSTS:
+            text = text.replace('https://' + host, mock_url.rstrip('/') + '/' + host)
+        text = text.replace('https://' + N8N_HOST, n8n_url.rstrip('/'))
+        with open(os.path.join(out_dir, file), 'w', encoding='utf-8') as f:
+            f.write(text)
+    return files
+
+
+def mcp_tools():
+    """Назви MCP tools з усіх воркфлоу репозиторію - для tools/list."""
+    tools = set()
+    for wf in repo_workflows().values():
+        for node in wf['nodes']:
+            tool = node.get('parameters', {}).get('tool')
+            if node.get('type', '').endswith('mcpClient') and isinstance(tool, dict):
+                tools.add(tool.get('value'))
+    return sorted(t for t in tools if t)
+
+
+class MockUpstream(ThreadingHTTPServer):
+    """Відповіді у форматі upstream API; ліміт - token bucket на хост, понад нього 429 з Retry-After."""
+    daemon_threads = True
+
+    def __init__(self, port, latency_ms, rate, rows, row_bytes):
+        super().__init__(('0.0.0.0', port), MockHandler)
+        self.latency_ms, self.rate, self.rows, self.row_bytes = latency_ms, rate, rows, row_bytes
+        self.tools = mcp_tools()
+        self.buckets = {}
+        self.stats = collections.Counter()
+        self.lock = threading.Lock()
+
+    def take(self, host):
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.time()
+            tokens, ts = self.buckets.get(host, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - ts) * self.rate)
+            allowed = tokens >= 1
+            self.buckets[host] = (tokens - 1 if allowed else tokens, now)
+            self.stats[host if allowed else host + ' 429'] += 1
+            return allowed
+
+    def table(self, count, offset=0):
+        count = max(0, min(count, self.rows - offset))
+        return [{
+            'keyword': f'keyword {offset + i}',
+            'url': f'https://example.com/page-{offset + i}',
+            'position': 1 + (offset + i) % 100,
+            'region_queries_count': random.randint(10, 100000),
+            'traffic': random.randint(0, 5000),
+            'padding': 'x' * self.row_bytes,
+        } for i in range(count)]
+
+    def text(self):
+        return 'Mock-відповідь. ' + 'x' * self.row_bytes * 10
+
+    def respond(self, host, path, body):
+        body = body if isinstance(body, dict) else {}
+        if host == 'api.ahrefs.com' and path.startswith('/mcp'):
+            return self.mcp(body)
+        if host == 'api.ahrefs.com':
+            return 200, {'targets': self.table(len(body.get('targets', [])) or 100)}
+        if host == 'api.serpstat.com':
+            params = body.get('params', {})
+            page, size = int(params.get('page', 1)), int(params.get('size', 1000))
+            return 200, {'id': body.get('id'), 'result': {
+                'data': self.table(size, (page - 1) * size), 'summary_info': {'total': self.rows, 'page': page}}}
+        if host == 'api.openai.com':
+            if path.endswith('/chat/completions'):
+                return 200, {'choices': [{'message': {'role': 'assistant', 'content': self.text()}}]}
+            if path.endswith('/responses'):
+                return 200, {'output_text': self.text(), 'output': [
+                    {'type': 'message', 'content': [{'type': 'output_text', 'text': self.text()}]}]}
+            return 200, {'id': 'file-mock', 'deleted': True}
+        if host == 'googleads.googleapis.com':
+            if path.endswith(':generateKeywordHistoricalMetrics'):
+                return 200, {'results': [{'text': k, 'keywordMetrics': {
+                    'avgMonthlySearches': str(random.randint(10, 100000)), 'competition': 'MEDIUM'}}
+                    for k in body.get('keywords', [])]}
+            offset = int(body.get('pageToken') or 0)
+            results = [{'text': r['keyword'], 'keywordIdeaMetrics': {
+                'avgMonthlySearches': str(r['region_queries_count']),
+                'competition': random.choice(['LOW', 'MEDIUM', 'HIGH'])}}
+                for r in self.table(GOOGLE_ADS_PAGE, offset)]
+            more = offset + GOOGLE_ADS_PAGE < self.rows
+            return 200, {'results': results, **({'nextPageToken': str(offset + GOOGLE_ADS_PAGE)} if more else {})}
+        if host == 'www.googleapis.com' and path.startswith('/pagespeedonline'):
+            audits = {a: {'title': a, 'score': round(random.random(), 2), 'displayValue': '1.2 s',
+                          'details': {'type': 'opportunity'}}
+                      for a in ('largest-contentful-paint', 'cumulative-layout-shift', 'total-blocking-time',
+                                'first-contentful-paint', 'speed-index', 'interactive')}
+            categories = {c: {'score': round(random.random(), 2)}
+                          for c in ('performance', 'accessibility', 'best-practices', 'seo')}
+            return 200, {'lighthouseResult': {'categories': categories, 'audits': audits}}
+        if host == 'sheets.googleapis.com':
+            rows = [[r['keyword'], r['url'], r['traffic']] for r in self.table(self.rows)]
+            if ':batchGet' in path:
+                return 200, {'valueRanges': [{'values': rows}]}
+            if '/values/' in path and not body:
+                return 200, {'values': rows}
+            if path.rstrip('/') == '/v4/spreadsheets':
+                return 200, {'spreadsheetId': 'mock-spreadsheet',
+                             'sheets': [{'properties': {'sheetId': 0, 'title': 'Sheet1'}}]}
+        return 200, {}
+
+    def mcp(self, body):
+        """Streamable HTTP: JSON-RPC відповідь одним application/json."""
+        method, params = body.get('method'), body.get('params') or {}
+        if 'id' not in body:
+            return 202, None
+        if method == 'initialize':
+            result = {'protocolVersion': params.get('protocolVersion', '2025-03-26'),
+                      'capabilities': {'tools': {}}, 'serverInfo': {'name': 'bench-mock', 'version': '1'}}
+        elif method == 'tools/list':
+            result = {'tools': [{'name': t, 'description': t, 'inputSchema': {'type': 'object'}} for t in self.tools]}
+        elif method == 'tools/call':
+            args = params.get('arguments') or {}
+            if 'limit' in args:
+                data = self.table(int(args['limit']), int(args.get('offset') or 0))
+            else:
+                data = {'metrics': {'org_traffic': random.randint(0, 10 ** 6), 'domain_rating': 50}}
+            result = {'content': [{'type': 'text', 'text': json.dumps(data)}]}
+        else:
+            return 200, {'jsonrpc': '2.0', 'id': body['id'], 'error': {'code': -32601, 'message': method}}
+        return 200, {'jsonrpc': '2.0', 'id': body['id'], 'result': result}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    def handle_any(self):
+        host, _, path = self.path.lstrip('/').partition('/')
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length)) if length else None
+        except ValueError:
+            body = None
+        if not self.server.take(host):
+            return self.reply(429, {'error': {'code': 429, 'message': 'mock rate limit'}}, {'Retry-After': '1'})
+        # Затримка з розкидом ±50%, як у реальних API
+        time.sleep(self.server.latency_ms / 1000 * random.uniform(0.5, 1.5))
+        status, payload = self.server.respond(host, '/' + path, body)
+        self.reply(status, payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_any
+
+    def reply(self, status, payload, headers=None):
+        raw = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+# ── Пам'ять: фоновий семплер /metrics ──
+class MemorySampler(threading.Thread):
+    PATTERN = re.compile(r'^process_resident_memory_bytes\s+([0-9.e+]+)', re.M)
+
+    def __init__(self, url, interval=1.0):
+        super().__init__(daemon=True)
+        self.url, self.interval = url, interval
+        self.peak = None
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            try:
+                with urllib.request.urlopen(self.url, timeout=5) as resp:
+                    m = self.PATTERN.search(resp.read().decode())
+                if m:
+                    self.peak = max(self.peak or 0, float(m.group(1)))
+            except (urllib.error.URLError, OSError):
+                pass
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join(timeout=5)
+
+
+# ── Виконання ──
+def find_execution(args, workflow_id, started_after, job_id=None):
+    """Чекає завершення виконання: за job_id (async-режим) або найновішого після старту."""
+    deadline = time.time() + args.timeout
+    while time.time() < deadline:
+        if job_id:
+            ex = api(args, f'executions/{job_id}?includeData=true')
+        else:
+            listing = api(args, f'executions?workflowId={workflow_id}&limit=5')
+            ex = None
+            for item in listing.get('data', []):
+                if parse_ts(item.get('startedAt')) >= started_after:
+                    ex = api(args, f"executions/{item['id']}?includeData=true")
+                    break
+        if ex and ex.get('finished') is not None and ex.get('stoppedAt'):
+            return ex
+        time.sleep(args.poll)
+    raise TimeoutError(f'виконання не завершилось за {args.timeout} с')
+
+
+def find_sub_executions(args, sub_workflows, ex):
+    """Виконання викликаних воркфлоу, що стартували в межах виконання сценарію.
+
+    sub_workflows: назва воркфлоу -> id. Виконання після stoppedAt (асинхронні частини
+    Audit Queue) не потрапляють; паралельні сторонні запуски тих самих воркфлоу - потрапляють.
+    """
+    started, stopped = parse_ts(ex.get('startedAt')), parse_ts(ex.get('stoppedAt'))
+    subs = []
+    for name, workflow_id in sub_workflows.items():
+        listing = api(args, f'executions?workflowId={workflow_id}&limit=250')
+        for item in listing.get('data', []):
+            if started <= parse_ts(item.get('startedAt')) <= stopped:
+                subs.append((name, item['id']))
+    deadline = time.time() + args.timeout
+    result = []
+    for name, execution_id in subs:
+        while True:
+            sub = api(args, f'executions/{execution_id}?includeData=true')
+            if (sub.get('finished') is not None and sub.get('stoppedAt')) or time.time() >= deadline:
+                break
+            time.sleep(args.poll)
+        result.append((name, sub))
+    return result
+
+
+def parse_ts(value):
+    if not value:
+        return 0
+    return datetime.fromisoformat(re.sub(r'\.\d+', '', value).replace('Z', '+00:00')).timestamp()
+
+
+def profile(ex):
+    """Час по вузлах: сума executionTime усіх запусків вузла (цикли рахуються разом)."""
+    run_data = ex.get('data', {}).get('resultData', {}).get('runData', {})
+    nodes = {}
+    for name, runs in run_data.items():
+        nodes[name] = {
+            'runs': len(runs),
+            'ms': sum(r.get('executionTime', 0) for r in runs),
+            'items': sum(len((r.get('data') or {}).get('main', [[]])[0] or []) for r in runs),
+        }
+    wall = (parse_ts(ex.get('stoppedAt')) - parse_ts(ex.get('startedAt'))) * 1000
+    return wall, nodes, run_data
+
+
+def count_units(scenario, run_data):
+    node, fn = scenario['units']
+    if node is None:
+        return fn({})
+    try:
+        return fn(run_data[node][-1]['data']['main'][0][0]['json'])
+    except (KeyError, IndexError, TypeError):
+        return 0
+
+
+def execution_status(ex):
+    return ex.get('status') or ('success' if ex.get('finished') else 'error')
+
+
+def run_once(args, name, scenario, workflow_id, sub_workflows, payload):
+    started = time.time() - 1
+    url = args.base.rstrip('/') + '/webhook/' + name
+    resp = request('POST', url, {**payload, 'async': True}, timeout=args.timeout)
+    job_id = resp.get('job_id') if isinstance(resp, dict) else None
+    ex = find_execution(args, workflow_id, started, job_id)
+    wall, nodes, run_data = profile(ex)
+    subs = []
+    for sub_name, sub in find_sub_executions(args, sub_workflows, ex):
+        sub_wall, sub_nodes, _ = profile(sub)
+        subs.append({'workflow': sub_name, 'execution_id': sub.get('id'),
+                     'status': execution_status(sub), 'wall_ms': round(sub_wall)})
+        # Той самий воркфлоу викликається кілька разів (Rate Limiter, Ahrefs Decode) - сумуємо
+        for node, stats in sub_nodes.items():
+            total = nodes.setdefault(f'{sub_name} / {node}', {'runs': 0, 'ms': 0, 'items': 0})
+            for key in total:
+                total[key] += stats[key]
+    return {
+        'execution_id': ex.get('id'),
+        'status': execution_status(ex),
+        'wall_ms': round(wall),
+        'units': count_units(scenario, run_data),
+        'nodes': nodes,
+        'sub_executions': subs,
+    }
+
+
+def summarize(name, scenario, runs, peak, mock=None):
+    walls = [r['wall_ms'] for r in runs]
+    units = sum(r['units'] for r in runs)
+    per = PER_HOUR[scenario['unit']]
+    throughput = units / (sum(walls) / 1000) * per if sum(walls) else 0
+
+    node_names = sorted({n for r in runs for n in r['nodes']})
+    nodes = {}
+    for n in node_names:
+        ms = [r['nodes'][n]['ms'] for r in runs if n in r['nodes']]
+        nodes[n] = {
+            'median_ms': round(statistics.median(ms)),
+            'max_ms': max(ms),
+            'runs': max(r['nodes'][n]['runs'] for r in runs if n in r['nodes']),
+        }
+    return {
+        'scenario': name,
+        'workflow': scenario['file'],
+        'runs': len(runs),
+        'wall_ms': {'median': round(statistics.median(walls)), 'min': min(walls), 'max': max(walls)},
+        'throughput': {scenario['unit']: round(throughput, 2), 'units': units},
+        'peak_rss_mb': round(peak / 1024 / 1024, 1) if peak else None,
+        'mock': mock,
+        'nodes': nodes,
+        'raw': runs,
+    }
+
+
+def compare(result, baseline):
+    """Нові вузли (напр. доданий Wait) і вузли, що стали помітно повільнішими."""
+    issues = []
+    old = baseline.get('nodes', {})
+    for n, cur in result['nodes'].items():
+        prev = old.get(n)
+        if prev is None:
+            issues.append(f'новий вузол: {n} ({cur["median_ms"]} ms)')
+        elif (cur['median_ms'] > prev['median_ms'] * REGRESSION_RATIO
+              and cur['median_ms'] - prev['median_ms'] >= REGRESSION_MIN_MS):
+            issues.append(f'повільніше: {n} {prev["median_ms"]} -> {cur["median_ms"]} ms')
+    prev_wall = baseline.get('wall_ms', {}).get('median')
+    cur_wall = result['wall_ms']['median']
+    if prev_wall and cur_wall > prev_wall * REGRESSION_RATIO and cur_wall - prev_wall >= REGRESSION_MIN_MS:
+        issues.append(f'загальний час: {prev_wall} -> {cur_wall} ms')
+    return issues
+
+
+def print_report(result, top):
+    print(f"\n{result['scenario']} ({result['workflow']}), запусків: {result['runs']}")
+    w = result['wall_ms']
+    print(f"  wall: median {w['median']} ms (min {w['min']}, max {w['max']})")
+    for unit, value in result['throughput'].items():
+        if unit != 'units':
+            print(f'  throughput: {value} {unit}')
+    if result['peak_rss_mb'] is not None:
+        print(f"  peak RSS: {result['peak_rss_mb']} MB")
+    subs = collections.Counter(s['workflow'] for r in result['raw'] for s in r.get('sub_executions', []))
+    if subs:
+        print('  викликані воркфлоу (виконань за всі запуски): '
+              + ', '.join(f'{name} {count}' for name, count in sorted(subs.items())))
+    if result.get('mock'):
+        print(f"  mock: {result['mock']['config']}")
+        for host, count in sorted(result['mock']['requests'].items()):
+            print(f'    {host}: {count}')
+    print(f"  {'вузол':<45} {'median ms':>10} {'runs':>6}")
+    slowest = sorted(result['nodes'].items(), key=lambda kv: -kv[1]['median_ms'])[:top]
+    for n, s in slowest:
+        print(f"  {n[:45]:<45} {s['median_ms']:>10} {s['runs']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenario', choices=sorted(SCENARIOS))
+    parser.add_argument('--base', default=os.environ.get('N8N_BASE', 'http://localhost:5678'))
+    parser.add_argument('--api-key', default=os.environ.get('N8N_API_KEY', ''))
+    parser.add_argument('--payload', help='JSON або шлях до .json, зливається з payload сценарію')
+    parser.add_argument('--workflow-id', help='ID воркфлоу в n8n (за замовч. - з JSON-файлу)')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--timeout', type=int, default=1800, help='секунд на одне виконання')
+    parser.add_argument('--poll', type=float, default=3.0)
+    parser.add_argument('--top', type=int, default=15, help='скільки найповільніших вузлів показати')
+    parser.add_argument('--no-metrics', action='store_true', help='не читати /metrics')
+    parser.add_argument('--out', help='зберегти результат у JSON')
+    parser.add_argument('--baseline', help='попередній результат для порівняння')
+    parser.add_argument('--mock', action='store_true', help='підняти локальний mock upstream API на час запусків')
+    parser.add_argument('--mock-port', type=int, default=8787)
+    parser.add_argument('--mock-latency', type=int, default=300, help='середня затримка відповіді, ms')
+    parser.add_argument('--mock-rate', type=float, default=5, help='запитів/с на хост, понад - 429 (0 - без ліміту)')
+    parser.add_argument('--mock-rows', type=int, default=5000, help='рядків у наборі даних (пагінація, розмір відповіді)')
+    parser.add_argument('--mock-row-bytes', type=int, default=200, help='додаткових байтів на рядок')
+    parser.add_argument('--mock-export', metavar='DIR',
+                        help='записати в DIR копії воркфлоу сценарію і викликаних ним з хостами API на mock і вийти')
+    parser.add_argument('--mock-url', help='адреса mock для n8n (за замовч. http://localhost:<mock-port>)')
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    if args.mock_export:
+        files = export_mock_workflows(scenario, args.mock_url or f'http://localhost:{args.mock_port}',
+                                      args.base, args.mock_export)
+        print(f'Збережено в {args.mock_export}: ' + ', '.join(files))
+        print('Імпортуйте всі в тестовий n8n і запускайте з --mock')
+        return
+
+    if not args.api_key:
+        parser.error('потрібен --api-key або N8N_API_KEY (n8n Settings -> API)')
+
+    payload = dict(scenario['payload'])
+    if args.payload:
+        text = open(args.payload).read() if os.path.exists(args.payload) else args.payload
+        payload.update(json.loads(text))
+
+    workflow_id = args.workflow_id or resolve_workflow_id(args, scenario['file'])
+    sub_workflows = {load_workflow(file).get('name', file): resolve_workflow_id(args, file)
+                     for file in called_workflows(scenario['file'])}
+
+    mock = None
+    if args.mock:
+        mock = MockUpstream(args.mock_port, args.mock_latency, args.mock_rate, args.mock_rows, args.mock_row_bytes)
+        threading.Thread(target=mock.serve_forever, daemon=True).start()
+
+    sampler = None
+    if not args.no_metrics:
+        sampler = MemorySampler(args.base.rstrip('/') + '/metrics')
+        sampler.start()
+
+    runs = []
+    try:
+        for i in range(args.runs):
+            r = run_once(args, args.scenario, scenario, workflow_id, sub_workflows, payload)
+            print(f"  run {i + 1}/{args.runs}: {r['status']}, {r['wall_ms']} ms, units: {r['units']}")
+            runs.append(r)
+    finally:
+        if sampler:
+            sampler.stop()
+        if mock:
+            mock.shutdown()
+
+    mock_stats = None
+    if mock:
+        mock_stats = {
+            'config': {'latency_ms': args.mock_latency, 'rate': args.mock_rate,
+                       'rows': args.mock_rows, 'row_bytes': args.mock_row_bytes},
+            'requests': dict(mock.stats),
+        }
+    result = summarize(args.scenario, scenario, runs, sampler.peak if sampler else None, mock_stats)
+    print_report(result, args.top)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'\nЗбережено: {args.out}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            issues = compare(result, json.load(f))
+        if issues:
+            print('\nРегресії відносно baseline:')
+            for issue in issues:
+                print('  - ' + issue)
+            sys.exit(1)
+        print('\nРегресій відносно baseline немає')
+
+
+if __name__ == '__main__':
+    main()
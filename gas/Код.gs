@@ -1,5 +1,5 @@
 // ============================================
-// РОУТИНГ: ?page=audit | ?page=master | ?page=gkp | ?page=gkp_ideas | ?page=gkp_metrics | ?page=pagespeed | ?page=pdf_audit | ?page=wizard
+// РОУТИНГ: ?page=audit | ?page=master | ?page=bulk | ?page=gkp | ?page=gkp_ideas | ?page=gkp_metrics | ?page=pagespeed | ?page=pdf_audit | ?page=wizard
 // ============================================
 
 function doGet(e) {
@@ -8,6 +8,7 @@ function doGet(e) {
   var pages = {
     'audit':       { file: 'form', title: 'Аналіз домену' },
     'master':      { file: 'analiz_domenu_form', title: 'Аналіз домену — Мастер' },
+    'bulk':        { file: 'bulk_audit_form', title: 'Bulk аудит доменів' },
     'gkp':         { file: 'gkp_form', title: 'Семантичне ядро (GKP)' },
     'gkp_ideas':   { file: 'gkp_ideas', title: 'GKP: Генерація ідей' },
     'gkp_metrics': { file: 'gkp_metrics', title: 'GKP: Метрики' },
@@ -23,6 +24,126 @@ function doGet(e) {
     .setXFrameOptionsMode(HtmlService.XFrameOptionsMode.ALLOWALL);
 }
 
+// ============================================
+// JOB API: асинхронні завдання n8n
+// ============================================
+// Воркфлоу отримує { async: true }, одразу повертає job_id і далі
+// пише прогрес у Job Status API. Форма опитує getJobStatus(job),
+// поки завдання не завершиться.
+
+var N8N_WEBHOOK_BASE = 'https://n8n.rnd.webpromo.tools/webhook/';
+var JOB_STALE_MINUTES = 15;  // етап без власного stale_after: без оновлень довше - вважаємо завдання завислим
+
+var JOB_STAGE_LABELS = {
+  queued: 'В черзі',
+  running_jobs: 'Виконуються аудити',
+  moving_files: 'Переміщення файлів у папку проекту',
+  fetching: 'Отримання даних',
+  testing: 'Тестування URL',
+  ai_analysis: 'AI аналіз',
+  ai_parsing: 'AI парсинг PDF',
+  ai_agents: 'AI агенти аналізують дані',
+  writing_sheet: 'Запис у таблицю',
+  writing_document: 'Формування документа'
+};
+
+// kind -> функція, що перетворює результат воркфлоу на відповідь для форми
+var JOB_RESULT_HANDLERS = {
+  analiz_domenu: buildAnalizDomenuResult,
+  bulk_audit: buildBulkAuditResult,
+  ai_report: buildAIAnalysisResult,
+  gkp_ideas: buildGKPIdeasResult,
+  gkp_metrics: buildGKPMetricsResult,
+  gkp_legacy: buildGKPResult,
+  pagespeed: buildPageSpeedResult,
+  pdf_audit: buildPdfAuditResult
+};
+
+function startJob(path, payload, kind, context) {
+  payload.async = true;
+
+  var options = {
+    method: 'POST',
+    contentType: 'application/json',
+    payload: JSON.stringify(payload),
+    muteHttpExceptions: true
+  };
+
+  try {
+    var response = UrlFetchApp.fetch(N8N_WEBHOOK_BASE + path, options);
+    var result = JSON.parse(response.getContentText());
+
+    if (!result.job_id) {
+      return { success: false, error: result.message || result.error || 'Воркфлоу не повернув job_id' };
+    }
+
+    var job = { id: result.job_id, kind: kind, startedAt: new Date().getTime() };
+    for (var key in (context || {})) {
+      job[key] = context[key];
+    }
+
+    return { success: true, pending: true, job: job, stage: 'queued', message: JOB_STAGE_LABELS.queued };
+  } catch (error) {
+    return { success: false, error: error.toString() };
+  }
+}
+
+function getJobStatus(job) {
+  var now = new Date().getTime();
+  var status;
+  try {
+    var response = UrlFetchApp.fetch(N8N_WEBHOOK_BASE + 'job?id=' + encodeURIComponent(job.id), { muteHttpExceptions: true });
+    status = JSON.parse(response.getContentText());
+    job.lastSeenAt = now;
+  } catch (error) {
+    // Мережевий збій при опитуванні - пробуємо ще раз наступного разу
+    status = { status: 'unknown' };
+  }
+
+  if (status.status === 'completed') {
+    return JOB_RESULT_HANDLERS[job.kind](status.result || {}, job);
+  }
+  if (status.status === 'failed') {
+    return { success: false, error: status.error || 'Завдання завершилось з помилкою' };
+  }
+
+  // Етап може задати власний stale_after (с) - напр. хвиля аудитів у мастері
+  var staleMinutes = status.stale_after ? Math.ceil(status.stale_after / 60) : JOB_STALE_MINUTES;
+  var idleMs;
+  if (typeof status.idle_seconds === 'number') {
+    // Час без оновлень рахує Job Status API - годинники n8n і Apps Script не порівнюються
+    idleMs = status.idle_seconds * 1000;
+  } else if (status.status === 'not_found') {
+    // Воркфлоу ще не записав жодного оновлення
+    idleMs = now - job.startedAt;
+  } else {
+    // Job Status API не відповів - рахуємо від останньої успішної відповіді, а не від старту
+    idleMs = now - (job.lastSeenAt || job.startedAt);
+  }
+  if (idleMs > staleMinutes * 60 * 1000) {
+    if (status.status === 'unknown') {
+      return { success: false, error: 'Job Status API не відповідає понад ' + staleMinutes + ' хв' };
+    }
+    return { success: false, error: 'Завдання не оновлювалось понад ' + staleMinutes + ' хв (етап: ' + (status.stage || status.status) + ')' };
+  }
+
+  var stage = status.stage || 'queued';
+  var message = JOB_STAGE_LABELS[stage] || stage;
+  if (status.progress && status.progress.total) {
+    message += ' (' + status.progress.done + '/' + status.progress.total + ')';
+  }
+
+  return {
+    success: true,
+    pending: true,
+    job: job,
+    stage: stage,
+    progress: status.progress || null,
+    partial: status.partial || {},
+    message: message
+  };
+}
+
 // ============================================
 // БЕКЕНД: Мастер — Аналіз домену (оркестратор)
 // ============================================
@@ -33,16 +154,13 @@ function submitAnalizDomenu(formData) {
     return { success: false, error: 'Невірний email менеджера' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/analiz-domenu';
-
   var payload = {
     manager_email: formData.manager_email.trim()
   };
 
   // Опціональні блоки
   if (formData.client_domain) {
-    payload.client_domain = formData.client_domain
-      .replace(/^https?:\/\//, '').replace(/^www\./, '').replace(/\/.*$/, '').toLowerCase().trim();
+    payload.client_domain = normalizeDomain(formData.client_domain);
   }
 
   if (formData.competitors && formData.competitors.length > 0) {
@@ -61,44 +179,37 @@ function submitAnalizDomenu(formData) {
     payload.pagespeed = formData.pagespeed;
   }
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true,
-    timeout: 600  // 10 хвилин — GKP/PageSpeed можуть бути довгими
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('analiz-domenu', payload, 'analiz_domenu');
+}
 
-    if (result.status === 'completed') {
-      return {
-        success: true,
-        folderUrl: result.folder_url || '',
-        details: result.results || {},
-        message: 'Аналіз завершено'
-      };
-    } else {
-      return { success: false, error: result.error || 'Невідома помилка від воркфлоу' };
-    }
-  } catch (error) {
-    return { success: false, error: error.toString() };
+function buildAnalizDomenuResult(result) {
+  if (result.status === 'completed') {
+    return {
+      success: true,
+      folderUrl: result.folder_url || '',
+      details: result.results || {},
+      message: 'Аналіз завершено'
+    };
   }
+  return { success: false, error: result.error || 'Невідома помилка від воркфлоу' };
 }
 
 // ============================================
 // БЕКЕНД: Аналіз конкурентів
 // ============================================
 
-function submitAudit(domain) {
-  var cleanDomain = domain
+// Домен без протоколу, www і шляху - спільне очищення для всіх форм
+function normalizeDomain(domain) {
+  return String(domain || '')
     .replace(/^https?:\/\//, '')
     .replace(/^www\./, '')
     .replace(/\/.*$/, '')
     .toLowerCase()
     .trim();
+}
+
+function submitAudit(domain) {
+  var cleanDomain = normalizeDomain(domain);
 
   if (!cleanDomain || !cleanDomain.includes('.')) {
     return { success: false, error: 'Невірний формат домену' };
@@ -133,6 +244,68 @@ function submitAudit(domain) {
   }
 }
 
+// ============================================
+// БЕКЕНД: Bulk аудит доменів
+// ============================================
+// Порівняння 50-200 кандидатів за DR / трафіком / реф. доменами одним
+// проходом batch-analysis; повні аудити - лише для top N
+
+var MAX_BULK_DOMAINS = 200;
+
+// Текст або CSV: по домену в рядку (перша клітинка, схожа на домен), дублікати відкидаються
+function parseDomainList(text) {
+  var seen = {};
+  var domains = [];
+  String(text || '').split(/\r?\n/).forEach(function(line) {
+    var cells = line.split(/[,;\t]/);
+    for (var i = 0; i < cells.length; i++) {
+      var domain = normalizeDomain(cells[i].trim().replace(/^"|"$/g, ''));
+      if (domain.indexOf('.') === -1) continue;
+      if (!seen[domain]) {
+        seen[domain] = true;
+        domains.push(domain);
+      }
+      break;
+    }
+  });
+  return domains;
+}
+
+function submitBulkAudit(formData) {
+  var domains = parseDomainList(formData.domains);
+
+  if (domains.length === 0) {
+    return { success: false, error: 'Не знайдено жодного домену' };
+  }
+  if (domains.length > MAX_BULK_DOMAINS) {
+    return { success: false, error: 'Максимум ' + MAX_BULK_DOMAINS + ' доменів, отримано ' + domains.length };
+  }
+
+  var payload = {
+    domains: domains,
+    top_n: Math.max(0, Math.min(parseInt(formData.top_n, 10) || 0, 20)),
+    country: formData.country || 'ua',
+    sort_by: formData.sort_by || 'organic_traffic'
+  };
+
+  return startJob('bulk-domain-audit', payload, 'bulk_audit', { totalDomains: domains.length });
+}
+
+function buildBulkAuditResult(result) {
+  if (result.status !== 'success') {
+    return { success: false, error: result.error || 'Невідома помилка від воркфлоу' };
+  }
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheet_url,
+    totalDomains: result.total_domains || 0,
+    failedDomains: result.failed_domains || 0,
+    top: result.top || [],
+    queued: result.queued || [],
+    message: 'Порівняно ' + (result.total_domains || 0) + ' доменів, повних аудитів у черзі: ' + (result.queued || []).length
+  };
+}
+
 // ============================================
 // УТИЛІТИ: Папка менеджера на Google Drive
 // ============================================
@@ -180,8 +353,6 @@ function submitAIAnalysis(formData) {
     return { success: false, error: 'Невірний формат посилання на таблицю' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/seo-audit-ai-report';
-
   var payload = {
     url: spreadsheetUrl
   };
@@ -190,39 +361,29 @@ function submitAIAnalysis(formData) {
     payload.manager_email = managerEmail;
   }
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('seo-audit-ai-report', payload, 'ai_report', { managerEmail: managerEmail });
+}
 
-    // Move doc to manager folder if email provided
-    if (managerEmail && result.docUrl) {
-      try {
-        var docId = extractFileIdFromUrl(result.docUrl);
-        if (docId) {
-          var folderId = findOrCreateManagerFolder(managerEmail);
-          moveFileToFolder(docId, folderId);
-        }
-      } catch (moveErr) {
-        // Non-critical: doc created but not moved
+function buildAIAnalysisResult(result, job) {
+  // Move doc to manager folder if email provided
+  if (job.managerEmail && result.docUrl) {
+    try {
+      var docId = extractFileIdFromUrl(result.docUrl);
+      if (docId) {
+        var folderId = findOrCreateManagerFolder(job.managerEmail);
+        moveFileToFolder(docId, folderId);
       }
+    } catch (moveErr) {
+      // Non-critical: doc created but not moved
     }
-
-    return {
-      success: true,
-      docUrl: result.docUrl,
-      domain: result.domain,
-      message: 'AI звіт створено для ' + result.domain
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
   }
+
+  return {
+    success: true,
+    docUrl: result.docUrl,
+    domain: result.domain,
+    message: 'AI звіт створено для ' + result.domain
+  };
 }
 
 // ============================================
@@ -235,8 +396,6 @@ function submitGKPIdeas(formData) {
     return { success: false, error: 'Вставте посилання на таблицю з seed-фразами' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/gkp-ideas';
-
   var payload = {
     doc_name: formData.doc_name || 'GKP Ideas - ' + new Date().toISOString().slice(0, 10),
     language: formData.language || '1036',
@@ -244,27 +403,17 @@ function submitGKPIdeas(formData) {
     source_spreadsheet_id: formData.source_spreadsheet_id
   };
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('gkp-ideas', payload, 'gkp_ideas');
+}
 
-    return {
-      success: true,
-      spreadsheetUrl: result.spreadsheet_url,
-      totalKeywords: result.total_keywords || 0,
-      totalBatches: result.total_batches_processed || 0,
-      message: 'Згенеровано ' + (result.total_keywords || 0) + ' ідей ключових слів'
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
-  }
+function buildGKPIdeasResult(result) {
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheet_url,
+    totalKeywords: result.total_keywords || 0,
+    totalBatches: result.total_batches_processed || 0,
+    message: 'Згенеровано ' + (result.total_keywords || 0) + ' ідей ключових слів'
+  };
 }
 
 // ============================================
@@ -277,8 +426,6 @@ function submitGKPMetrics(formData) {
     return { success: false, error: 'Вставте посилання на таблицю з ключовими словами' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/gkp-metrics';
-
   var payload = {
     doc_name: formData.doc_name || 'GKP Metrics - ' + new Date().toISOString().slice(0, 10),
     language: formData.language || '1036',
@@ -286,28 +433,18 @@ function submitGKPMetrics(formData) {
     source_spreadsheet_id: formData.source_spreadsheet_id
   };
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('gkp-metrics', payload, 'gkp_metrics');
+}
 
-    return {
-      success: true,
-      spreadsheetUrl: result.spreadsheet_url,
-      totalKeywords: result.total_keywords || 0,
-      keywordsWithData: result.keywords_with_data || 0,
-      keywordsNoData: result.keywords_no_data || 0,
-      message: 'Отримано метрики для ' + (result.total_keywords || 0) + ' ключових слів'
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
-  }
+function buildGKPMetricsResult(result) {
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheet_url,
+    totalKeywords: result.total_keywords || 0,
+    keywordsWithData: result.keywords_with_data || 0,
+    keywordsNoData: result.keywords_no_data || 0,
+    message: 'Отримано метрики для ' + (result.total_keywords || 0) + ' ключових слів'
+  };
 }
 
 // ============================================
@@ -320,8 +457,6 @@ function submitGKP(formData) {
     return { success: false, error: 'Введіть хоча б одне ключове слово' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/gkp-ideas';
-
   // Парсинг url_mapping з текстового поля (формат: keyword | url)
   var urlMapping = {};
   if (formData.url_mapping_text) {
@@ -345,30 +480,20 @@ function submitGKP(formData) {
     limit: parseInt(formData.limit) || 600
   };
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('gkp-ideas', payload, 'gkp_legacy', { totalSeeds: formData.seed_keywords.length });
+}
 
-    var totalKeywords = result.total_keywords || 0;
-    var totalSeeds = formData.seed_keywords.length;
+function buildGKPResult(result, job) {
+  var totalKeywords = result.total_keywords || 0;
+  var totalSeeds = job.totalSeeds || 0;
 
-    return {
-      success: true,
-      spreadsheetUrl: result.spreadsheet_url,
-      totalKeywords: totalKeywords,
-      totalClusters: totalSeeds,
-      message: 'Знайдено ' + totalKeywords + ' ключових слів з ' + totalSeeds + ' сід-фраз'
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
-  }
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheet_url,
+    totalKeywords: totalKeywords,
+    totalClusters: totalSeeds,
+    message: 'Знайдено ' + totalKeywords + ' ключових слів з ' + totalSeeds + ' сід-фраз'
+  };
 }
 
 // ============================================
@@ -387,37 +512,23 @@ function submitPageSpeedTest(formData) {
     return { success: false, error: 'Не вдалося отримати ID таблиці' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/pagespeed-test';
-
   var payload = {
     spreadsheetId: match[1],
     testMobile: formData.testMobile !== false,
-    testDesktop: formData.testDesktop !== false,
-    batchSize: 5,
-    delaySeconds: 5
+    testDesktop: formData.testDesktop !== false
   };
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('pagespeed-test', payload, 'pagespeed');
+}
 
-    return {
-      success: true,
-      spreadsheetUrl: result.spreadsheet_url,
-      totalUrls: result.total_urls || 0,
-      processingTime: result.processing_time_seconds || 0,
-      message: 'PageSpeed тест завершено для ' + (result.total_urls || 0) + ' URL'
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
-  }
+function buildPageSpeedResult(result) {
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheet_url,
+    totalUrls: result.total_urls || 0,
+    processingTime: result.processing_time_seconds || 0,
+    message: 'PageSpeed тест завершено для ' + (result.total_urls || 0) + ' URL'
+  };
 }
 
 // ============================================
@@ -430,8 +541,6 @@ function submitPdfAuditParse(formData) {
     return { success: false, error: 'Невірний формат посилання на PDF файл. Має бути Google Drive URL' };
   }
 
-  var webhookUrl = 'https://n8n.rnd.webpromo.tools/webhook/parse-pdf-audit';
-
   var payload = {
     pdfUrl: formData.pdfUrl
   };
@@ -440,39 +549,28 @@ function submitPdfAuditParse(formData) {
     payload.manager_email = formData.manager_email;
   }
 
-  var options = {
-    method: 'POST',
-    contentType: 'application/json',
-    payload: JSON.stringify(payload),
-    muteHttpExceptions: true,
-    timeout: 300000  // 5 хвилин таймаут для великих PDF
-  };
-
-  try {
-    var response = UrlFetchApp.fetch(webhookUrl, options);
-    var result = JSON.parse(response.getContentText());
+  return startJob('parse-pdf-audit', payload, 'pdf_audit', { managerEmail: formData.manager_email || '' });
+}
 
-    // Move spreadsheet to manager folder if email provided
-    if (formData.manager_email && result.spreadsheetUrl) {
-      try {
-        var sheetId = extractFileIdFromUrl(result.spreadsheetUrl);
-        if (sheetId) {
-          var folderId = findOrCreateManagerFolder(formData.manager_email);
-          moveFileToFolder(sheetId, folderId);
-        }
-      } catch (moveErr) {
-        // Non-critical: sheet created but not moved
+function buildPdfAuditResult(result, job) {
+  // Move spreadsheet to manager folder if email provided
+  if (job.managerEmail && result.spreadsheetUrl) {
+    try {
+      var sheetId = extractFileIdFromUrl(result.spreadsheetUrl);
+      if (sheetId) {
+        var folderId = findOrCreateManagerFolder(job.managerEmail);
+        moveFileToFolder(sheetId, folderId);
       }
+    } catch (moveErr) {
+      // Non-critical: sheet created but not moved
     }
-
-    return {
-      success: true,
-      spreadsheetUrl: result.spreadsheetUrl,
-      totalSheets: result.totalSheets || 15,
-      processingTime: result.processingTime || 0,
-      message: 'PDF документ успішно спарсено'
-    };
-  } catch (error) {
-    return { success: false, error: error.toString() };
   }
+
+  return {
+    success: true,
+    spreadsheetUrl: result.spreadsheetUrl,
+    totalSheets: result.totalSheets || 15,
+    processingTime: result.processingTime || 0,
+    message: 'PDF документ успішно спарсено'
+  };
 }
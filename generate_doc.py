@@ -1,653 +1,778 @@
 #!/usr/bin/env python3
 """Generate project documentation as a formatted .docx file in Ukrainian."""
 
-from docx import Document
-from docx.shared import Inches, Pt, Cm, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.enum.section import WD_ORIENT
-from docx.oxml.ns import qn, nsdecls
-from docx.oxml import parse_xml
+import argparse
 import os
 
-doc = Document()
-
-# ── Styles ──
-style = doc.styles['Normal']
-style.font.name = 'Arial'
-style.font.size = Pt(11)
-style.paragraph_format.space_after = Pt(6)
-style.paragraph_format.line_spacing = 1.15
-
-for level in range(1, 4):
-    hs = doc.styles[f'Heading {level}']
-    hs.font.name = 'Arial'
-    hs.font.color.rgb = RGBColor(0x1B, 0x3A, 0x57)
-
-doc.styles['Heading 1'].font.size = Pt(20)
-doc.styles['Heading 2'].font.size = Pt(15)
-doc.styles['Heading 3'].font.size = Pt(12)
-
-# ── Helpers ──
-NAVY = RGBColor(0x1B, 0x3A, 0x57)
-DARK = RGBColor(0x33, 0x33, 0x33)
-GRAY = RGBColor(0x66, 0x66, 0x66)
-LINK_BLUE = RGBColor(0x1A, 0x73, 0xE8)
-WHITE = RGBColor(0xFF, 0xFF, 0xFF)
-
-def add_paragraph(text, bold=False, italic=False, color=None, size=None, align=None):
-    p = doc.add_paragraph()
-    run = p.add_run(text)
-    run.bold = bold
-    run.italic = italic
-    if color:
-        run.font.color.rgb = color
-    if size:
-        run.font.size = Pt(size)
-    if align:
-        p.alignment = align
-    return p
-
-def add_bullet(text, level=0):
-    p = doc.add_paragraph(text, style='List Bullet')
-    p.paragraph_format.left_indent = Cm(1.27 + level * 1.27)
-    return p
-
-def add_table(headers, rows, col_widths=None):
-    table = doc.add_table(rows=1 + len(rows), cols=len(headers))
-    table.style = 'Table Grid'
-    table.alignment = WD_TABLE_ALIGNMENT.LEFT
-
-    # Header row
-    hdr = table.rows[0]
-    for i, h in enumerate(headers):
-        cell = hdr.cells[i]
-        cell.text = ''
-        p = cell.paragraphs[0]
-        run = p.add_run(h)
-        run.bold = True
-        run.font.size = Pt(10)
-        run.font.color.rgb = WHITE
-        shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="1B3A57"/>')
-        cell._tc.get_or_add_tcPr().append(shading)
-
-    # Data rows
-    for ri, row in enumerate(rows):
-        for ci, val in enumerate(row):
-            cell = table.rows[ri + 1].cells[ci]
-            cell.text = ''
-            p = cell.paragraphs[0]
-            run = p.add_run(str(val))
-            run.font.size = Pt(10)
-            # Alternate row shading
-            if ri % 2 == 0:
-                shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="F0F4F8"/>')
-                cell._tc.get_or_add_tcPr().append(shading)
-
-    if col_widths:
-        for i, w in enumerate(col_widths):
-            for row in table.rows:
-                row.cells[i].width = Cm(w)
-
-    doc.add_paragraph()  # spacing
-    return table
-
-def add_code_block(text):
-    p = doc.add_paragraph()
-    p.paragraph_format.left_indent = Cm(1)
-    run = p.add_run(text)
-    run.font.name = 'Courier New'
-    run.font.size = Pt(9)
-    run.font.color.rgb = DARK
-    shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="F5F5F5"/>')
-    p._p.get_or_add_pPr().append(shading)
-    return p
-
-# ═══════════════════════════════════════
-# TITLE PAGE
-# ═══════════════════════════════════════
-
-doc.add_paragraph()
-doc.add_paragraph()
-title = doc.add_paragraph()
-title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-run = title.add_run('SEO AUDIT AUTOMATION PLATFORM')
-run.bold = True
-run.font.size = Pt(28)
-run.font.color.rgb = NAVY
-
-subtitle = doc.add_paragraph()
-subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-run = subtitle.add_run('Технічна документація проекту')
-run.font.size = Pt(16)
-run.font.color.rgb = GRAY
-
-doc.add_paragraph()
-info = doc.add_paragraph()
-info.alignment = WD_ALIGN_PARAGRAPH.CENTER
-run = info.add_run('WebPromo | SEO Department')
-run.font.size = Pt(12)
-run.font.color.rgb = GRAY
-
-date_p = doc.add_paragraph()
-date_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-run = date_p.add_run('Лютий 2026')
-run.font.size = Pt(12)
-run.font.color.rgb = GRAY
-
-doc.add_page_break()
-
-# ═══════════════════════════════════════
-# TABLE OF CONTENTS (manual)
-# ═══════════════════════════════════════
-
-doc.add_heading('Зміст', level=1)
-toc_items = [
-    '1. Огляд проекту',
-    '2. Сховища даних та коду',
-    '3. Архітектура системи',
-    '4. Веб-інтерфейс (GAS) — сторінки та маршрутизація',
-    '5. Бекенд-функції (Код.gs)',
-    '6. n8n Воркфлоу — детальний опис',
-    '   6.1. SEO-аудит домену (основний)',
-    '   6.2. Мастер-оркестратор "Аналіз домену"',
-    '   6.3. AI-генератор звіту',
-    '   6.4. PDF Audit Parser',
-    '   6.5. GKP Universal System (семантика)',
-    '   6.6. PageSpeed Test',
-    '   6.7. Аудит посилального профілю',
-    '7. Зведена таблиця ендпоінтів',
-    '8. Зовнішні API та авторизація',
-    '9. Структура Google Drive',
-    '10. Структура файлів у репозиторії',
-    '11. Нотатки щодо деплою',
-]
-for item in toc_items:
-    p = doc.add_paragraph(item)
-    p.paragraph_format.space_after = Pt(2)
-    if item.startswith('   '):
-        p.paragraph_format.left_indent = Cm(1.5)
-
-doc.add_page_break()
-
-# ═══════════════════════════════════════
-# 1. OVERVIEW
-# ═══════════════════════════════════════
-
-doc.add_heading('1. Огляд проекту', level=1)
-
-add_paragraph(
-    'Автоматизована платформа для комплексного SEO-аналізу. '
-    'Побудована на n8n (автоматизація воркфлоу), Google Apps Script (фронтенд + бекенд-проксі) '
-    'та зовнішніх API (Ahrefs, SimilarWeb, Serpstat, Google Ads, OpenAI).'
-)
-
-add_paragraph('Основні можливості:', bold=True)
-add_bullet('Комплексний SEO-аудит домену (трафік, ключові слова, беклінки, поведінкові метрики)')
-add_bullet('AI-аналіз зібраних даних з генерацією звіту у Google Doc')
-add_bullet('Парсинг PDF-аудитів у структуровані Google-таблиці')
-add_bullet('Збір семантичного ядра через Google Keyword Planner (генерація ідей + метрики)')
-add_bullet('Масове тестування швидкості сторінок через PageSpeed Insights')
-add_bullet('Аудит посилального профілю (беклінки, анкори, DR)')
-add_bullet('Мастер-оркестратор для запуску всіх аналізів з однієї форми')
-
-# ═══════════════════════════════════════
-# 2. STORAGE
-# ═══════════════════════════════════════
-
-doc.add_heading('2. Сховища даних та коду', level=1)
-
-add_table(
-    ['Ресурс', 'URL', 'Опис'],
-    [
-        ['Google Apps Script', 'https://script.google.com/home/projects/1UM5kbeqZwQUuv4fe-cz61xjaLxYSNMH7DkFW7ez8YmIn3MCNlQNBmcCL/edit', 'Фронтенд (HTML-форми) + бекенд (webhook-проксі). Деплоїться як Web App'],
-        ['GitHub', 'https://github.com/wp-dev-RdnIgr/n8n_seo_audit', 'Git-репозиторій: GAS-код + JSON-експорти n8n воркфлоу'],
-        ['Google Drive', 'https://drive.google.com/drive/u/0/folders/1A3Ak929G1c4XmZpPtI2FP4glrFE2-Bx2', 'Коренева папка для всіх згенерованих звітів'],
-        ['Веб-інтерфейс', 'https://sites.google.com/web-promo.com.ua/seo-audit/', 'Google Sites сторінка з вбудованими GAS-формами через iframe'],
-        ['Browse AI', 'https://dashboard.browse.ai/workspaces/web-promo-com-ua/robots', 'Боти-парсери для скрапінгу SimilarWeb'],
-        ['n8n', 'https://n8n.rnd.webpromo.tools', 'Self-hosted n8n інстанс з усіма воркфлоу'],
-    ],
-    col_widths=[3.5, 7, 6]
-)
-
-# ═══════════════════════════════════════
-# 3. ARCHITECTURE
-# ═══════════════════════════════════════
-
-doc.add_heading('3. Архітектура системи', level=1)
-
-add_paragraph('Потік даних:', bold=True)
-
-arch_lines = [
-    '[Google Sites сторінка]',
-    '    |',
-    '    +-- iframe --> [GAS Web App (?page=...)]',
-    '                       |',
-    '                       +-- google.script.run --> [Код.gs бекенд-функції]',
-    '                                                     |',
-    '                                                     +-- UrlFetchApp.fetch() --> [n8n вебхуки]',
-    '                                                                                      |',
-    '                                                                                      +-- Ahrefs API (MCP)',
-    '                                                                                      +-- Google Ads API',
-    '                                                                                      +-- Serpstat API',
-    '                                                                                      +-- Browse AI (SimilarWeb)',
-    '                                                                                      +-- OpenAI GPT-4o',
-    '                                                                                      +-- Google Drive/Sheets/Docs API',
-    '                                                                                      +-- PageSpeed Insights API',
-]
-for line in arch_lines:
-    add_code_block(line)
-
-add_paragraph('')
-add_paragraph('Принцип роботи:', bold=True)
-add_bullet('Користувач відкриває Google Sites сторінку')
-add_bullet('Сторінка містить iframe з GAS Web App (HTML-форма)')
-add_bullet('Форма викликає бекенд-функцію через google.script.run')
-add_bullet('Бекенд-функція відправляє POST-запит на n8n webhook')
-add_bullet('n8n воркфлоу виконує всю роботу (збір даних, аналіз, генерація звітів)')
-add_bullet('Результат повертається у відповіді вебхуку і відображається у формі')
-
-# ═══════════════════════════════════════
-# 4. FRONTEND PAGES
-# ═══════════════════════════════════════
-
-doc.add_heading('4. Веб-інтерфейс (GAS) — сторінки та маршрутизація', level=1)
-
-add_paragraph(
-    'Маршрутизація виконується через URL-параметр ?page=... у функції doGet(e) (Код.gs). '
-    'За замовчуванням відкривається сторінка "audit".'
-)
-
-add_table(
-    ['Параметр page', 'HTML-файл', 'Назва', 'Опис'],
-    [
-        ['audit (за замовч.)', 'form.html', 'Аналіз домену', 'Ввід домену -> повний SEO-аудит + кнопка AI-звіту'],
-        ['master', 'analiz_domenu_form.html', 'Аналіз домену — Мастер', 'Оркестратор: 5 блоків (клієнт, конкуренти, семантика, метрики, PageSpeed)'],
-        ['gkp', 'gkp_form.html', 'Семантичне ядро (GKP)', 'Legacy-форма: ручний ввід seed-ключів (теги)'],
-        ['gkp_ideas', 'gkp_ideas.html', 'GKP: Генерація ідей', 'Етап 1 — генерація ідей з таблиці seed-фраз'],
-        ['gkp_metrics', 'gkp_metrics.html', 'GKP: Метрики', 'Етап 2 — отримання обсягів пошуку з таблиці ключів'],
-        ['pagespeed', 'pagespeed_form.html', 'PageSpeed Test', 'Масове тестування швидкості з таблиці URL-ів'],
-        ['pdf_audit', 'pdf_audit_form.html', 'SEO AI Інструменти', 'Дві секції: AI-аналіз домену + парсинг PDF-аудиту'],
-    ],
-    col_widths=[3, 4, 3.5, 6]
-)
-
-# ═══════════════════════════════════════
-# 5. BACKEND FUNCTIONS
-# ═══════════════════════════════════════
-
-doc.add_heading('5. Бекенд-функції (Код.gs)', level=1)
-
-add_paragraph(
-    'Усі бекенд-функції знаходяться у файлі Код.gs. Кожна функція приймає дані з HTML-форми, '
-    'валідує їх і відправляє POST-запит на відповідний n8n webhook.'
-)
-
-# 5.1
-doc.add_heading('5.1. submitAudit(domain)', level=3)
-add_bullet('Викликається з: form.html (сторінка "Аналіз домену")')
-add_bullet('Webhook: POST /webhook/seo-organic-traffic-v74')
-add_bullet('Payload: { domain, country: "ua", top_pages_limit: 50 }')
-add_bullet('Відповідь: { success, spreadsheetUrl, message }')
-add_bullet('Дія: Запускає повний SEO-аудит домену. Повертає посилання на Google Sheet.')
-
-# 5.2
-doc.add_heading('5.2. submitAIAnalysis(spreadsheetUrl)', level=3)
-add_bullet('Викликається з: form.html (секція AI) та pdf_audit_form.html (картка "AI аналіз домену")')
-add_bullet('Webhook: POST /webhook-test/seo-audit-ai-report')
-add_bullet('Payload: { url: spreadsheetUrl }')
-add_bullet('Відповідь: { success, docUrl, domain, message }')
-add_bullet('Дія: Надсилає таблицю на AI-аналіз. GPT-4o аналізує всі листи, генерує Google Doc.')
-
-# 5.3
-doc.add_heading('5.3. submitAnalizDomenu(formData)', level=3)
-add_bullet('Викликається з: analiz_domenu_form.html (сторінка "Мастер")')
-add_bullet('Webhook: POST /webhook/analiz-domenu')
-add_bullet('Payload: { manager_email, client_domain?, competitors[]?, semantic_expansion?, metrics_collection?, pagespeed? }')
-add_bullet('Відповідь: { success, folderUrl, details, message }')
-add_bullet('Дія: Мастер-оркестратор. Створює структуру папок на Google Drive, послідовно запускає обрані блоки аналізу.')
-
-# 5.4
-doc.add_heading('5.4. submitGKP(formData) — legacy', level=3)
-add_bullet('Викликається з: gkp_form.html')
-add_bullet('Webhook: POST /webhook/gkp-ideas')
-add_bullet('Payload: { doc_name, language, geo_target, seed_keywords, url_mapping, limit }')
-add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, totalClusters, message }')
-
-# 5.5
-doc.add_heading('5.5. submitGKPIdeas(formData)', level=3)
-add_bullet('Викликається з: gkp_ideas.html')
-add_bullet('Webhook: POST /webhook/gkp-ideas')
-add_bullet('Payload: { doc_name, language, geo_target, source_spreadsheet_id }')
-add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, totalBatches, message }')
-
-# 5.6
-doc.add_heading('5.6. submitGKPMetrics(formData)', level=3)
-add_bullet('Викликається з: gkp_metrics.html')
-add_bullet('Webhook: POST /webhook/gkp-metrics')
-add_bullet('Payload: { doc_name, language, geo_target, source_spreadsheet_id }')
-add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, keywordsWithData, keywordsNoData, message }')
-
-# 5.7
-doc.add_heading('5.7. submitPageSpeedTest(formData)', level=3)
-add_bullet('Викликається з: pagespeed_form.html')
-add_bullet('Webhook: POST /webhook/pagespeed-test')
-add_bullet('Payload: { spreadsheetId, testMobile, testDesktop, batchSize: 5, delaySeconds: 5 }')
-add_bullet('Відповідь: { success, spreadsheetUrl, totalUrls, processingTime, message }')
-
-# 5.8
-doc.add_heading('5.8. submitPdfAuditParse(formData)', level=3)
-add_bullet('Викликається з: pdf_audit_form.html (картка "AI аналіз PDF документа")')
-add_bullet('Webhook: POST /webhook-test/parse-pdf-audit')
-add_bullet('Payload: { pdfUrl }')
-add_bullet('Відповідь: { success, spreadsheetUrl, totalSheets, processingTime, message }')
-
-# ═══════════════════════════════════════
-# 6. N8N WORKFLOWS
-# ═══════════════════════════════════════
-
-doc.add_heading('6. n8n Воркфлоу — детальний опис', level=1)
-
-# 6.1
-doc.add_heading('6.1. SEO-аудит домену (основний)', level=2)
-add_paragraph('Файл: Sheet 8 - Traffic Pages Nodes (1).json', italic=True, color=GRAY)
-
-add_paragraph('Вебхуки:', bold=True)
-add_table(
-    ['Шлях', 'Метод', 'Призначення'],
-    [
-        ['seo-organic-traffic-v74', 'POST', 'Основна точка входу — запуск аудиту'],
-        ['browse-ai-callback-v74', 'POST', 'Зворотний виклик від Browse AI після завершення скрапінгу'],
-        ['seo-audit-full-v74', 'POST', 'Внутрішній тригер для збору даних Ahrefs + Serpstat'],
+from docx.shared import Pt, Cm, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from report_renderer import DocBuilder, NAVY, GRAY
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_documentation(builder):
+    doc = builder.doc
+    add_paragraph = builder.add_paragraph
+    add_bullet = builder.add_bullet
+    add_table = builder.add_table
+    add_code_block = builder.add_code_block
+
+    # ═══════════════════════════════════════
+    # TITLE PAGE
+    # ═══════════════════════════════════════
+
+    doc.add_paragraph()
+    doc.add_paragraph()
+    title = doc.add_paragraph()
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = title.add_run('SEO AUDIT AUTOMATION PLATFORM')
+    run.bold = True
+    run.font.size = Pt(28)
+    run.font.color.rgb = NAVY
+
+    subtitle = doc.add_paragraph()
+    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = subtitle.add_run('Технічна документація проекту')
+    run.font.size = Pt(16)
+    run.font.color.rgb = GRAY
+
+    doc.add_paragraph()
+    info = doc.add_paragraph()
+    info.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = info.add_run('WebPromo | SEO Department')
+    run.font.size = Pt(12)
+    run.font.color.rgb = GRAY
+
+    date_p = doc.add_paragraph()
+    date_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = date_p.add_run('Лютий 2026')
+    run.font.size = Pt(12)
+    run.font.color.rgb = GRAY
+
+    doc.add_page_break()
+
+    # ═══════════════════════════════════════
+    # TABLE OF CONTENTS (manual)
+    # ═══════════════════════════════════════
+
+    doc.add_heading('Зміст', level=1)
+    toc_items = [
+        '1. Огляд проекту',
+        '2. Сховища даних та коду',
+        '3. Архітектура системи',
+        '4. Веб-інтерфейс (GAS) — сторінки та маршрутизація',
+        '5. Бекенд-функції (Код.gs)',
+        '6. n8n Воркфлоу — детальний опис',
+        '   6.1. SEO-аудит домену (основний)',
+        '   6.2. Мастер-оркестратор "Аналіз домену"',
+        '   6.3. AI-генератор звіту',
+        '   6.4. PDF Audit Parser',
+        '   6.5. GKP Universal System (семантика)',
+        '   6.6. PageSpeed Test',
+        '   6.7. Аудит посилального профілю',
+        '   6.8. Bulk аудит доменів',
+        '7. Зведена таблиця ендпоінтів',
+        '8. Зовнішні API та авторизація',
+        '9. Структура Google Drive',
+        '10. Структура файлів у репозиторії',
+        '11. Нотатки щодо деплою',
+    ]
+    for item in toc_items:
+        p = doc.add_paragraph(item)
+        p.paragraph_format.space_after = Pt(2)
+        if item.startswith('   '):
+            p.paragraph_format.left_indent = Cm(1.5)
+
+    doc.add_page_break()
+
+    # ═══════════════════════════════════════
+    # 1. OVERVIEW
+    # ═══════════════════════════════════════
+
+    doc.add_heading('1. Огляд проекту', level=1)
+
+    add_paragraph(
+        'Автоматизована платформа для комплексного SEO-аналізу. '
+        'Побудована на n8n (автоматизація воркфлоу), Google Apps Script (фронтенд + бекенд-проксі) '
+        'та зовнішніх API (Ahrefs, SimilarWeb, Serpstat, Google Ads, OpenAI).'
+    )
+
+    add_paragraph('Основні можливості:', bold=True)
+    add_bullet('Комплексний SEO-аудит домену (трафік, ключові слова, беклінки, поведінкові метрики)')
+    add_bullet('AI-аналіз зібраних даних з генерацією звіту у Google Doc')
+    add_bullet('Парсинг PDF-аудитів у структуровані Google-таблиці')
+    add_bullet('Збір семантичного ядра через Google Keyword Planner (генерація ідей + метрики)')
+    add_bullet('Масове тестування швидкості сторінок через PageSpeed Insights')
+    add_bullet('Аудит посилального профілю (беклінки, анкори, DR)')
+    add_bullet('Мастер-оркестратор для запуску всіх аналізів з однієї форми')
+
+    # ═══════════════════════════════════════
+    # 2. STORAGE
+    # ═══════════════════════════════════════
+
+    doc.add_heading('2. Сховища даних та коду', level=1)
+
+    add_table(
+        ['Ресурс', 'URL', 'Опис'],
+        [
+            ['Google Apps Script', 'https://script.google.com/home/projects/1UM5kbeqZwQUuv4fe-cz61xjaLxYSNMH7DkFW7ez8YmIn3MCNlQNBmcCL/edit', 'Фронтенд (HTML-форми) + бекенд (webhook-проксі). Деплоїться як Web App'],
+            ['GitHub', 'https://github.com/wp-dev-RdnIgr/n8n_seo_audit', 'Git-репозиторій: GAS-код + JSON-експорти n8n воркфлоу'],
+            ['Google Drive', 'https://drive.google.com/drive/u/0/folders/1A3Ak929G1c4XmZpPtI2FP4glrFE2-Bx2', 'Коренева папка для всіх згенерованих звітів'],
+            ['Веб-інтерфейс', 'https://sites.google.com/web-promo.com.ua/seo-audit/', 'Google Sites сторінка з вбудованими GAS-формами через iframe'],
+            ['Browse AI', 'https://dashboard.browse.ai/workspaces/web-promo-com-ua/robots', 'Боти-парсери для скрапінгу SimilarWeb'],
+            ['n8n', 'https://n8n.rnd.webpromo.tools', 'Self-hosted n8n інстанс з усіма воркфлоу'],
+        ],
+        col_widths=[3.5, 7, 6]
+    )
+
+    # ═══════════════════════════════════════
+    # 3. ARCHITECTURE
+    # ═══════════════════════════════════════
+
+    doc.add_heading('3. Архітектура системи', level=1)
+
+    add_paragraph('Потік даних:', bold=True)
+
+    arch_lines = [
+        '[Google Sites сторінка]',
+        '    |',
+        '    +-- iframe --> [GAS Web App (?page=...)]',
+        '                       |',
+        '                       +-- google.script.run --> [Код.gs бекенд-функції]',
+        '                                                     |',
+        '                                                     +-- UrlFetchApp.fetch() --> [n8n вебхуки]',
+        '                                                                                      |',
+        '                                                                                      +-- Ahrefs API (MCP)',
+        '                                                                                      +-- Google Ads API',
+        '                                                                                      +-- Serpstat API',
+        '                                                                                      +-- Browse AI (SimilarWeb)',
+        '                                                                                      +-- OpenAI GPT-4o',
+        '                                                                                      +-- Google Drive/Sheets/Docs API',
+        '                                                                                      +-- PageSpeed Insights API',
+    ]
+    for line in arch_lines:
+        add_code_block(line)
+
+    add_paragraph('')
+    add_paragraph('Принцип роботи:', bold=True)
+    add_bullet('Користувач відкриває Google Sites сторінку')
+    add_bullet('Сторінка містить iframe з GAS Web App (HTML-форма)')
+    add_bullet('Форма викликає бекенд-функцію через google.script.run')
+    add_bullet('Бекенд-функція відправляє POST-запит на n8n webhook')
+    add_bullet('n8n воркфлоу виконує всю роботу (збір даних, аналіз, генерація звітів)')
+    add_bullet('Результат повертається у відповіді вебхуку і відображається у формі')
+
+    # ═══════════════════════════════════════
+    # 4. FRONTEND PAGES
+    # ═══════════════════════════════════════
+
+    doc.add_heading('4. Веб-інтерфейс (GAS) — сторінки та маршрутизація', level=1)
+
+    add_paragraph(
+        'Маршрутизація виконується через URL-параметр ?page=... у функції doGet(e) (Код.gs). '
+        'За замовчуванням відкривається сторінка "audit".'
+    )
+
+    add_table(
+        ['Параметр page', 'HTML-файл', 'Назва', 'Опис'],
+        [
+            ['audit (за замовч.)', 'form.html', 'Аналіз домену', 'Ввід домену -> повний SEO-аудит + кнопка AI-звіту'],
+            ['master', 'analiz_domenu_form.html', 'Аналіз домену — Мастер', 'Оркестратор: 5 блоків (клієнт, конкуренти, семантика, метрики, PageSpeed)'],
+            ['bulk', 'bulk_audit_form.html', 'Bulk аудит доменів', 'Список / CSV до 200 доменів -> таблиця-порівняння, повний аудит для top N'],
+            ['gkp', 'gkp_form.html', 'Семантичне ядро (GKP)', 'Legacy-форма: ручний ввід seed-ключів (теги)'],
+            ['gkp_ideas', 'gkp_ideas.html', 'GKP: Генерація ідей', 'Етап 1 — генерація ідей з таблиці seed-фраз'],
+            ['gkp_metrics', 'gkp_metrics.html', 'GKP: Метрики', 'Етап 2 — отримання обсягів пошуку з таблиці ключів'],
+            ['pagespeed', 'pagespeed_form.html', 'PageSpeed Test', 'Масове тестування швидкості з таблиці URL-ів'],
+            ['pdf_audit', 'pdf_audit_form.html', 'SEO AI Інструменти', 'Дві секції: AI-аналіз домену + парсинг PDF-аудиту'],
+        ],
+        col_widths=[3, 4, 3.5, 6]
+    )
+
+    # ═══════════════════════════════════════
+    # 5. BACKEND FUNCTIONS
+    # ═══════════════════════════════════════
+
+    doc.add_heading('5. Бекенд-функції (Код.gs)', level=1)
+
+    add_paragraph(
+        'Усі бекенд-функції знаходяться у файлі Код.gs. Кожна функція приймає дані з HTML-форми, '
+        'валідує їх і відправляє POST-запит на відповідний n8n webhook.'
+    )
+
+    add_paragraph(
+        'Довгі завдання (усі, крім submitAudit) запускаються асинхронно: функція надсилає payload з '
+        'async: true, воркфлоу одразу відповідає { status: "accepted", job_id } і продовжує роботу, '
+        'записуючи етапи у Job Status API. Форма отримує { pending: true, job } і кожні 5 секунд '
+        'викликає getJobStatus(job), поки не прийде фінальна відповідь у форматі, описаному нижче.'
+    )
+
+    add_paragraph(
+        'Job Status API тримає завдання в таблиці async_jobs SEO Store: кожне оновлення - атомарний upsert, '
+        'фінальний статус (completed / failed) не перезаписується пізнім прогресом. Job Status API також '
+        'errorWorkflow асинхронних воркфлоу: необроблена помилка позначає завдання failed (GKP, що має власний '
+        'errorWorkflow, позначає failed збої запитів до Sheets і перекидає помилку далі). Завдання вважається '
+        'завислим, якщо API повертає idle_seconds більше за stale_after етапу (за замовч. 15 хв); збій опитування '
+        'рахується від останньої успішної відповіді.'
+    )
+
+    # 5.1
+    doc.add_heading('5.1. submitAudit(domain)', level=3)
+    add_bullet('Викликається з: form.html (сторінка "Аналіз домену")')
+    add_bullet('Webhook: POST /webhook/seo-organic-traffic-v74')
+    add_bullet('Payload: { domain, country: "ua", top_pages_limit: 50 }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, message }')
+    add_bullet('Дія: Запускає повний SEO-аудит домену. Повертає посилання на Google Sheet.')
+
+    # 5.2
+    doc.add_heading('5.2. submitAIAnalysis(spreadsheetUrl)', level=3)
+    add_bullet('Викликається з: form.html (секція AI) та pdf_audit_form.html (картка "AI аналіз домену")')
+    add_bullet('Webhook: POST /webhook-test/seo-audit-ai-report')
+    add_bullet('Payload: { url: spreadsheetUrl }')
+    add_bullet('Відповідь: { success, docUrl, domain, message }')
+    add_bullet('Дія: Надсилає таблицю на AI-аналіз. GPT-4o аналізує всі листи, генерує Google Doc.')
+
+    # 5.3
+    doc.add_heading('5.3. submitAnalizDomenu(formData)', level=3)
+    add_bullet('Викликається з: analiz_domenu_form.html (сторінка "Мастер")')
+    add_bullet('Webhook: POST /webhook/analiz-domenu')
+    add_bullet('Payload: { manager_email, client_domain?, competitors[]?, semantic_expansion?, metrics_collection?, pagespeed? }')
+    add_bullet('Відповідь: { success, folderUrl, details, message }')
+    add_bullet('Дія: Мастер-оркестратор. Створює структуру папок на Google Drive, послідовно запускає обрані блоки аналізу.')
+
+    # 5.4
+    doc.add_heading('5.4. submitGKP(formData) — legacy', level=3)
+    add_bullet('Викликається з: gkp_form.html')
+    add_bullet('Webhook: POST /webhook/gkp-ideas')
+    add_bullet('Payload: { doc_name, language, geo_target, seed_keywords, url_mapping, limit }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, totalClusters, message }')
+
+    # 5.5
+    doc.add_heading('5.5. submitGKPIdeas(formData)', level=3)
+    add_bullet('Викликається з: gkp_ideas.html')
+    add_bullet('Webhook: POST /webhook/gkp-ideas')
+    add_bullet('Payload: { doc_name, language, geo_target, source_spreadsheet_id }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, totalBatches, message }')
+
+    # 5.6
+    doc.add_heading('5.6. submitGKPMetrics(formData)', level=3)
+    add_bullet('Викликається з: gkp_metrics.html')
+    add_bullet('Webhook: POST /webhook/gkp-metrics')
+    add_bullet('Payload: { doc_name, language, geo_target, source_spreadsheet_id }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalKeywords, keywordsWithData, keywordsNoData, message }')
+
+    # 5.7
+    doc.add_heading('5.7. submitPageSpeedTest(formData)', level=3)
+    add_bullet('Викликається з: pagespeed_form.html')
+    add_bullet('Webhook: POST /webhook/pagespeed-test')
+    add_bullet('Payload: { spreadsheetId, testMobile, testDesktop, qpsQuota?, maxConcurrency? }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalUrls, processingTime, message }')
+
+    # 5.8
+    doc.add_heading('5.8. submitPdfAuditParse(formData)', level=3)
+    add_bullet('Викликається з: pdf_audit_form.html (картка "AI аналіз PDF документа")')
+    add_bullet('Webhook: POST /webhook-test/parse-pdf-audit')
+    add_bullet('Payload: { pdfUrl }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalSheets, processingTime, message }')
+
+    # 5.9
+    doc.add_heading('5.9. submitBulkAudit(formData)', level=3)
+    add_bullet('Викликається з: bulk_audit_form.html')
+    add_bullet('Webhook: POST /webhook/bulk-domain-audit')
+    add_bullet('Домени: parseDomainList() - по рядку або CSV, очищення normalizeDomain() (спільне з submitAudit і submitAnalizDomenu), дедуплікація, до 200')
+    add_bullet('Payload: { domains[], top_n, country, sort_by }')
+    add_bullet('Відповідь: { success, spreadsheetUrl, totalDomains, failedDomains, top[], queued[], message }')
+
+    # ═══════════════════════════════════════
+    # 6. N8N WORKFLOWS
+    # ═══════════════════════════════════════
+
+    doc.add_heading('6. n8n Воркфлоу — детальний опис', level=1)
+
+    # 6.1
+    doc.add_heading('6.1. SEO-аудит домену (основний)', level=2)
+    add_paragraph('Файл: Sheet 8 - Traffic Pages Nodes (1).json', italic=True, color=GRAY)
+
+    add_paragraph('Вебхуки:', bold=True)
+    add_table(
+        ['Шлях', 'Метод', 'Призначення'],
+        [
+            ['seo-organic-traffic-v74', 'POST', 'Основна точка входу — запуск аудиту'],
+            ['browse-ai-callback-v74', 'POST', 'Зворотний виклик від Browse AI після завершення скрапінгу'],
+            ['seo-audit-full-v74', 'POST', 'Внутрішній: збір Ahrefs + Serpstat і запис листів; '
+                                           'після черги (body.parts) - лише запис листів'],
+        ]
+    )
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Отримує домен -> копіює шаблон таблиці seo_audit одразу в папку на Drive (Sheet Templates)')
+    add_bullet('Усі 6 листів, ширини колонок, фільтри і закріплені рядки вже є в копії, sheetId приходять у відповіді; '
+               'після запису форматуються лише шапки секцій - одним batchUpdate на всі листи', level=1)
+    add_bullet('2. Запускає Browse AI для скрапінгу SimilarWeb (трафік, канали, пристрої, соцмережі)')
+    add_bullet('3. Відразу повертає URL таблиці (асинхронна обробка)')
+    add_bullet('4. Browse AI callback записує поведінкові дані у Лист 1')
+    add_bullet('Таблицю, sheetId листів і зміщення рядків callback бере з реєстру аудитів (таблиця audit_registry '
+               'SEO Store, рядок на запуск, ключ — id задачі Browse AI) без пошуку на Drive; пошук за назвою лишився '
+               'запасним варіантом. Зміщення для Full Audit читається і позначається одним UPDATE', level=1)
+    add_bullet('5. Ставить Full Audit у чергу (Audit Queue): збір даних ділиться на незалежні частини')
+    add_bullet('Частини виконуються паралельно на воркерах n8n queue mode; коли готові всі, черга викликає '
+               'seo-audit-full-v74 з готовими відповідями - лишаються форматування і запис листів', level=1)
+    add_bullet('Збір частини - sub-workflow Audit Fetch (кеш, дельта історії, rate limit, Decode, Keyword Warehouse); '
+               'без черги (POST seo-audit-full-v74 без parts) аудит викликає той самий Audit Fetch по частинах', level=1)
+    add_bullet('6. Паралельні виклики Ahrefs API (через MCP): трафік, беклінки, DR, реф-домени, анкори')
+    add_bullet('Sub-workflow Ahrefs Decode (Ahrefs_Decode.json) одразу після MCP-вузлів розбирає text-JSON один раз у компактні таблиці '
+               '(фіксований порядок колонок на кожен вузол, числа - числами); історія, кеш, черга, '
+               'Format Data і Prepare Sheet N читають лише їх', level=1)
+    add_bullet('7. Виклики Serpstat API: ключові слова з позиціями (до 5000, з пагінацією)')
+    add_bullet('Сторінки пагінації складаються у SEO Store (spill_pages) під ключем виконання; '
+               'цикл несе лише лічильники, Spill Read - Serpstat забирає сторінки одним запитом', level=1)
+    add_bullet('Ключі Serpstat зберігаються у Keyword Warehouse (домен, країна, дата) для крос-доменного аналізу', level=1)
+    add_bullet('Відповіді Ahrefs (24 год) і Serpstat (48 год) кешуються у Response Cache за ключем '
+               '(домен, країна, період, дата); повторний аудит того ж домену не витрачає кредити API. '
+               'Примусове оновлення: no_cache: true у тілі запиту', level=1)
+    add_bullet('Кеш — таблиця response_cache у SEO Store (Postgres): рядок на відповідь з expires_at, '
+               'запис не чіпає інших записів, прострочені рядки видаляються при записі; понад бюджет 512 МБ '
+               'запис витісняє найдавніше прочитані рядки (LRU за last_accessed_at); '
+               'ключ рахує один вузол Cache Key для cache-get і cache-put', level=1)
+    add_bullet('Історичні ряди (трафік, сторінки, DR, реф-домени) зберігаються між запусками в таблиці history_series '
+               'SEO Store (рядок на домен і ряд); повторний аудит запитує в Ahrefs лише точки від останньої збереженої дати, '
+               'а ряд, зібраний уже після date_to, не запитує зовсім - і не витрачає токен Rate Limiter. '
+               'Повне перезавантаження ряду — раз на 30 днів або з no_cache: true', level=1)
+    add_bullet('8. Записує всі листи аудиту одним values:batchUpdate (чанки до 2 МБ / 50 000 клітинок); '
+               'при 429/5xx повторюються лише чанки, що впали')
+
+    add_paragraph('Згенеровані листи:', bold=True)
+    add_table(
+        ['Лист №', 'Назва', 'Джерело даних', 'Зміст'],
+        [
+            ['1', 'Органічний_трафік', 'Ahrefs + SimilarWeb', 'Огляд трафіку, історія, гео-розподіл, канали'],
+            ['2', '(вбудований у Лист 1)', 'SimilarWeb / Browse AI', 'Брендовий vs небрендовий трафік, метрики залученості'],
+            ['3', 'Посилальний_профіль', 'Ahrefs', 'Історія DR, реф-домени, розподіл анкорів'],
+            ['4', 'Всі_беклінки', 'Ahrefs', 'Усі беклінки (топ-100 за DR)'],
+            ['5', 'Топ_сторінки_за_посиланнями', 'Ahrefs', 'Топ сторінок за кількістю реф-доменів'],
+            ['6', 'Поведінкові_метрики', 'SimilarWeb / Browse AI', 'Соцтрафік, реферери, видавці'],
+            ['7', 'Ключові_фрази', 'Serpstat', 'До 5000 ключів з обсягами, позиціями, інтентом'],
+            ['8', 'Трафікогенеруючі_сторінки', 'Serpstat (агреговано)', 'Сторінки згруповані за трафіком з топ-ключем'],
+        ],
+        col_widths=[1.5, 4.5, 3.5, 7]
+    )
+
+    add_paragraph('Зовнішні API:', bold=True)
+    add_bullet('Ahrefs (MCP протокол) — метрики домену, беклінки, анкори, DR')
+    add_bullet('SimilarWeb (через Browse AI скрапінг) — поведінкові метрики')
+    add_bullet('Serpstat API (api.serpstat.com/v4) — ключові слова')
+    add_bullet('Cloudinary — хостинг SVG-графіків')
+    add_bullet('Google Drive / Sheets API — управління файлами')
+
+    add_paragraph('Вхідні параметри:', bold=True)
+    add_code_block('{ "domain": "example.com (обов\'язково)", "country": "ua (за замовч.)", "top_pages_limit": 50 }')
+
+    add_paragraph('Sheet Templates (Sheet_Templates.json):', bold=True)
+    add_bullet('POST /webhook/sheet-provision { type, name, folder_id } — один Drive files.copy версійованого шаблону '
+               'замість створення таблиці, кожного листа і статичного форматування; повертає spreadsheetId і sheetId листів')
+    add_bullet('Типи: seo_audit, link_profile, pagespeed, gkp_ideas, gkp_metrics, bulk_compare. Специфікація листів '
+               '(назви, sheetId, ширини, шапки, фільтри, закріплені рядки) — у вузлі Resolve Template')
+    add_bullet('Шаблон створюється за специфікацією при першому запиті і реєструється в SEO Store (sheet_templates); '
+               'зміна специфікації — підняти version, наступний запит створить новий шаблон', level=1)
+    add_bullet('Паралельні перші запити: шаблон створює лише власник заявки (Template Claim), решта перевіряють '
+               'реєстр кожні 3 с; запис видаляється лише коли files.copy повертає 404', level=1)
+
+    add_paragraph('Audit Queue (Audit_Queue.json):', bold=True)
+    add_bullet('POST /webhook/audit-enqueue { ...тіло Full Audit, tenant } — 4 незалежні частини: traffic (Лист 1), '
+               'links (Листи 3, 5), backlinks, serpstat (Листи 7, 8); відповідь 202 з run_id, '
+               'прогрес — Job Status API (job_id audit-<run_id>)')
+    add_bullet('Черга, оренди, результати частин і бар\'єр — таблиці audit_runs / audit_jobs у SEO Store (Postgres); '
+               'частини виконуються на будь-якій кількості воркерів, аудити масштабуються горизонтально')
+    add_bullet('Оренда частини має дедлайн (lease_until, 15 хв); диспетчер повертає прострочені оренди в чергу '
+               'з attempt+1, тож частина впалого воркера не губиться. Вибір — FOR UPDATE SKIP LOCKED, без опитування ключів', level=1)
+    add_bullet('Диспетчер (раз на 10 с): ліміт паралельних частин на тип (бюджети Ahrefs / Serpstat) і '
+               'round-robin між тенантами — tenant з тіла запиту, email менеджера або bulk-<запуск>', level=1)
+    add_bullet('Невдала частина повертається в чергу і перезапитує лише себе (до 3 спроб), потім позначається '
+               'failed і відповідні секції лишаються порожніми; повторний enqueue того ж runId дозапускає '
+               'тільки частини без результату', level=1)
+    add_bullet('Бар\'єр: останній звіт частини бачить усі результати, атомарний UPDATE finalized_at гарантує один виклик '
+               'seo-audit-full-v74 на запуск', level=1)
+    add_bullet('Кожна частина проходить Audit Fetch (Audit_Fetch.json): Response Cache, дельта історії, '
+               'rate limit і Keyword Warehouse працюють однаково в черзі і на синхронному шляху', level=1)
+
+    add_paragraph('Rate Limiter (Rate_Limiter.json):', bold=True)
+    add_bullet('Sub-workflow, який викликають безпосередньо перед кожним запитом до Ahrefs MCP, Serpstat, '
+               'Sheets API (запис і форматування) та generateKeywordIdeas: вхід api і cost, вихід - після очікування')
+    add_bullet('Token bucket на API - таблиця rate_buckets у SEO Store: поповнення і списання одним UPDATE, '
+               'тож ліміт спільний для всіх воркфлоу, паралельних аудитів і воркерів n8n', level=1)
+    add_bullet('Бюджети (capacity, refill_per_sec) задає seo_store.sql: Ahrefs і Sheets - 60 запитів/хв, '
+               'Serpstat - 1 запит / 3 с, Google Ads ideas - 5 підряд, далі 1 запит/с', level=1)
+
+    # 6.2
+    doc.add_heading('6.2. Мастер-оркестратор "Аналіз домену"', level=2)
+    add_paragraph('Файл: Analiz_Domenu_Master.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook/analiz-domenu', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Отримує email менеджера + опціональні блоки аналізу')
+    add_bullet('2. Шукає / створює персональну папку менеджера на Google Drive')
+    add_bullet('3. Створює підпапку проекту "{домен} - {дата}"')
+    add_bullet('4. Паралельно запускає обрані блоки хвилями по max_parallel (за замовч. 3), наступна хвиля — після завершення попередньої:')
+    add_bullet('Аудит домену клієнта (викликає seo-organic-traffic-v74)', level=1)
+    add_bullet('Аудит конкурентів (окремий job на кожного конкурента)', level=1)
+    add_bullet('Розширення семантики (викликає gkp-ideas)', level=1)
+    add_bullet('Збір метрик (викликає gkp-metrics)', level=1)
+    add_bullet('PageSpeed тест (викликає pagespeed-test)', level=1)
+    add_bullet('5. Переміщує всі згенеровані файли у папку проекту')
+    add_bullet('6. Повертає URL папки + статус кожного блоку')
+
+    # 6.3
+    doc.add_heading('6.3. AI-генератор звіту', level=2)
+    add_paragraph('Файл: SEO_Audit_AI_Report.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook-test/seo-audit-ai-report', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Отримує URL / ID таблиці')
+    add_bullet('2. Зчитує всі 6 листів даних через Google Sheets API batchGet')
+    add_bullet('3. Серіалізує кожен лист у компактний CSV з оцінкою токенів; листи понад 8000 токенів ріже на частини (до 4)')
+    add_bullet('4. Перевіряє кеш секцій (хеш даних листа + версія промпту) — агенти з незміненими даними не викликаються')
+    add_bullet('5. Викликає GPT-4o агентів хвилями по 3 виклики (наступна хвиля — після відповідей попередньої), '
+               'кожен аналізує один лист; для великих листів — map по частинах + reduce:')
+    add_bullet('Агент 1: Аналіз органічного трафіку', level=1)
+    add_bullet('Агент 2: Аналіз посилального профілю', level=1)
+    add_bullet('Агент 3: Топ сторінки за посиланнями', level=1)
+    add_bullet('Агент 4: Поведінкові метрики', level=1)
+    add_bullet('Агент 5: Аналіз ключових слів', level=1)
+    add_bullet('Агент 6: Трафікогенеруючі сторінки', level=1)
+    add_bullet('6. Об\'єднує секції з кешу та нових відповідей, свіжі секції зберігає в кеш (7 днів)')
+    add_bullet('7. Запускає Summary Agent — створює резюме з усіх секцій')
+    add_bullet('8. Створює Google Doc з форматуванням (шрифти Montserrat/Open Sans, navy/gold кольори)')
+    add_bullet('9. Переміщує документ до папки таблиці-джерела')
+    add_paragraph('Результат: URL Google Doc з форматованим AI-звітом', bold=True)
+    add_paragraph(
+        'Локальний рендер: report_renderer.py будує той самий брендований звіт у .docx за один прохід '
+        'з виходу Collect Sections + тексту Final Summary Agent (поле finalSummary) — без Google Docs API. '
+        'Пакетний режим рендерить звіти кількох доменів паралельно в пулі процесів.'
+    )
+    add_code_block('python3 report_renderer.py sections.json -o report.docx')
+    add_code_block('python3 report_renderer.py reports/*.json --out-dir out --workers 4')
+    add_paragraph(
+        'Таблиці понад 200 рядків (експорт Serpstat / GKP у Word) DocBuilder.add_table будує через '
+        'add_bulk_table: XML рядків збирається зі спільних фрагментів заливки та ширини і парситься '
+        'пачками по 200 рядків, без рядка на всю таблицю. Порівняння шляхів: python3 bench_tables.py'
+    )
+
+    # 6.4
+    doc.add_heading('6.4. PDF Audit Parser', level=2)
+    add_paragraph('Файл: PDF_Audit_Parser.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook-test/parse-pdf-audit', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Отримує URL PDF-файлу з Google Drive')
+    add_bullet('2. Бере SHA-256 файлу з метаданих Drive і шукає готовий результат у Response Cache (30 днів); '
+               'при hit таблиця будується одразу, без завантаження і викликів AI. Примусове оновлення: no_cache: true')
+    add_bullet('3. Завантажує PDF з Google Drive і витягує текстовий шар посторінково')
+    add_bullet('4. Ділить сторінки на діапазони (по 3, до 12 діапазонів), кожному — лише секції шаблону, знайдені в його тексті; '
+               'діапазони обробляються GPT-4o хвилями по 4 (наступна хвиля — після відповідей попередньої, temperature: 0.1)')
+    add_bullet('Невдалий діапазон повторюється в наступних хвилях (до 3 спроб); діапазони, що так і не розібрались, '
+               'повертаються у failedChunks зі статусом partial (success: false), результат не кешується', level=1)
+    add_bullet('Скановані PDF без текстового шару — як раніше: завантаження у OpenAI Files API і один запит на весь файл', level=1)
+    add_bullet('5. Об\'єднує часткові JSON і видобуває 15 секцій: General Info, Summary, Content Types, URL Structure, Server Codes, Indexability, Meta Robots, Canonical, URL Depth, Loading Speed, Protocols, SEO Elements, Content Metrics, Errors, Scan Settings')
+    add_bullet('6. Створює нову Google-таблицю з відформатованими даними')
+    add_bullet('7. Застосовує форматування: секційні заголовки (темно-сині), підзаголовки (блакитні), заголовки таблиць (сірі)')
+    add_bullet('8. Видаляє тимчасовий файл з OpenAI (лише для сканованих PDF)')
+    add_bullet('9. Повертає URL таблиці')
+
+    add_paragraph('Вхід: { "pdfUrl": "Google Drive URL" }', bold=True)
+    add_paragraph('Вихід: { "spreadsheetUrl", "totalRows", "processingTime", "mode", "chunks" }', bold=True)
+
+    # 6.5
+    doc.add_heading('6.5. GKP Universal System (семантика)', level=2)
+    add_paragraph('Файл: GKP_Universal_System.json', italic=True, color=GRAY)
+
+    add_table(
+        ['Webhook', 'Призначення'],
+        [
+            ['gkp-ideas', 'Етап 1 — генерація ідей ключових слів із seed-фраз'],
+            ['gkp-metrics', 'Етап 2 — отримання обсягів пошуку для конкретних ключів'],
+        ]
+    )
+
+    add_paragraph('Етап 1 (Генерація ідей):', bold=True)
+    add_bullet('Зчитує seed-фрази з Google Sheet (колонка A) або тіла запиту')
+    add_bullet('Розбиває на батчі по 10 фраз')
+    add_bullet('Викликає Google Ads API generateKeywordIdeas хвилями: до 5 батчів паралельно (concurrency у тілі запиту), '
+               'пагінація 1000/сторінка, квота — Rate Limiter (токен на кожен запит)')
+    add_bullet('Дедуплікує на льоту і тримає лише топ-3000 (конкуренція, обсяг) у SEO Store (spill_topk): '
+               'хвиля зливається в топ одним запитом; '
+               'наступні сторінки не запитуються, коли вони вже не змінюють топ (до 100 викликів API за запуск)')
+    add_bullet('Записує у копію шаблону gkp_ideas: [Ключове слово, Обсяг пошуку, Конкуренція, Індекс конкуренції, Seed-фраза]')
+
+    add_paragraph('Етап 2 (Метрики):', bold=True)
+    add_bullet('Зчитує ключові слова з Google Sheet або тіла запиту (до 100 000)')
+    add_bullet('Нормалізує ключі (NFKC, регістр, пробіли, апострофи) і видаляє дублікати')
+    add_bullet('Шукає метрики кожного ключа у Response Cache на поточний місяць: ключі розкладені по 64 кошиках '
+               '(хеш ключа, мова, гео), запис кешу - кошик цілком, тож запуск читає і пише до 64 записів; '
+               'до API йдуть лише промахи, батчами по 10 000')
+    add_bullet('Викликає Google Ads API generateKeywordHistoricalMetrics; свіжі метрики зберігаються в кеш (31 день), '
+               'відповідь містить cache_hit_ratio і api_calls_saved. Примусове оновлення: no_cache: true')
+    add_bullet('Записує: [Ключове слово, Обсяг, Конкуренція, Індекс, Помісячні обсяги]')
+    add_bullet('Результати обох етапів також зберігаються у Keyword Warehouse (гео + мова, дата)')
+
+    add_paragraph('Keyword Warehouse (Keyword_Warehouse.json):', bold=True)
+    add_bullet('Склад ключів Serpstat і GKP у SEO Store (kw_partitions / kw_rows): партиція на джерело / домен / гео / дату, '
+               'рядок на ключ; до 3 знімків на домен, до 500 000 рядків загалом')
+    add_bullet('Запис партиції - один запит, витіснення - окремий: паралельні kw-put не гублять партиції', level=1)
+    add_bullet('Агрегації kw-query рахує Postgres одним запитом', level=1)
+    add_bullet('kw-query op=pages — трафік по URL і top-k ключів кожної сторінки')
+    add_bullet('kw-query op=gap — ключі, за якими ранжуються конкуренти (min_competitors), але не клієнт')
+    add_bullet('kw-query op=volumes — останні обсяги GKP для списку ключів; op=stats — перелік партицій')
+
+    # 6.6
+    doc.add_heading('6.6. PageSpeed Test', level=2)
+    add_paragraph('Файл: PageSpeed_Test.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook/pagespeed-test', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Зчитує URL-адреси з Google Sheet (колонка A)')
+    add_bullet('2. Копіює шаблон pagespeed з 4 вкладками: Mobile Results, Desktop Results, Comparison, Recommendations')
+    add_bullet('3. Тестує кожен URL через Google PageSpeed Insights API v5: паралельне вікно запитів '
+               '(до qpsQuota × 4, AIMD), ретраї 429/5xx з експоненційним backoff')
+    add_bullet('Готові URL одразу дописуються у вкладки Mobile/Desktop Results', level=1)
+    add_bullet('Запит з fields= (оцінки категорій, title/score/displayValue аудитів) - без скріншотів і details; '
+               'Compact Responses стискає відповідь до запису на URL (~300 Б)', level=1)
+    add_bullet('4. Метрики: Performance, Accessibility, Best Practices, SEO, FCP, LCP, TBT, CLS, Speed Index, TTI')
+    add_bullet('5. Запускає GPT-4o-mini для AI-коментарів до кожної вкладки')
+    add_bullet('6. Записує результати; шапки і фільтри вже в шаблоні, після запису - лише autoResize колонок')
+
+    # 6.7
+    doc.add_heading('6.7. Аудит посилального профілю', level=2)
+    add_paragraph('Файл: Zovnishnya_skladova.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook/link-profile-audit', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Створює папку на Google Drive')
+    add_bullet('2. Копіює шаблон link_profile з 4 вкладками одразу в цю папку (шапки, ширини, закріплені рядки)')
+    add_bullet('3. Виклики Ahrefs API (MCP): DR, статистика беклінків, анкори (топ-50), топ сторінки (100) - '
+               'перед ними один виклик Rate Limiter (ahrefs, cost 4) на всі чотири запити')
+    add_bullet('4. Всі беклінки — той самий MCP tool site-explorer-all-backlinks (з date) хвилями по 5 сторінок через Rate Limiter; '
+               'кількість сторінок рахується зі статистики, вибірка зупиняється на першій неповній сторінці. Невдала сторінка '
+               'повторюється в наступних хвилях (до 3 спроб); сторінки, що так і не прийшли, повертаються у failed_pages зі статусом partial')
+    add_bullet('Відповіді MCP і кожну хвилю беклінків розбирає той самий sub-workflow Ahrefs Decode; беклінки між хвилями зберігаються '
+               'рядками з 7 типізованих колонок, а не об\'єктами', level=1)
+    add_bullet('5. Записує 4 листи одним запитом після Rate Limiter (sheets_write); окреме форматування не потрібне:')
+    add_bullet('Link Profile (DR, ранг, статистика беклінків)', level=1)
+    add_bullet('Anchor List (топ-50 анкорів з %)', level=1)
+    add_bullet('Top Pages (100 сторінок за реф-доменами)', level=1)
+    add_bullet('All Backlinks (до 5000, відсортовано за трафіком)', level=1)
+
+    # 6.8
+    doc.add_heading('6.8. Bulk аудит доменів', level=2)
+    add_paragraph('Файл: Bulk_Domain_Audit.json', italic=True, color=GRAY)
+    add_paragraph('Webhook: POST /webhook/bulk-domain-audit', italic=True, color=GRAY)
+
+    add_paragraph('Потік даних:', bold=True)
+    add_bullet('1. Нормалізує і дедуплікує список доменів (масив або текст/CSV, до 200)')
+    add_bullet('2. Ahrefs MCP batch-analysis (credential Ahrefs_mcp): до 100 доменів за виклик, пачки послідовно')
+    add_bullet('Перед викликом - Rate Limiter (api ahrefs, cost = кількість пачок); відповіді розбирає Ahrefs Decode '
+               'у типізовані рядки, Rank Domains читає лише таблиці', level=1)
+    add_bullet('Поля: DR, органічний трафік / ключі / вартість, реф. домени, беклінки - ті самі, що Format Data (Full)', level=1)
+    add_bullet('3. Ранжує за sort_by (organic_traffic | domain_rating | refdomains); домени без даних - в кінці')
+    add_bullet('4. Копіює шаблон bulk_compare з вкладкою "Порівняння" (шапка, формат чисел, фільтр, закріплений рядок)')
+    add_bullet('5. Ставить повні аудити (seo-organic-traffic-v74) лише для top N (за замовч. 5) хвилями по max_parallel: '
+               'Audit Waves подає наступну хвилю після відповідей на всю попередню')
+    add_bullet('6. Повертає URL таблиці, top-10 і статус кожного поставленого аудиту')
+
+    # ═══════════════════════════════════════
+    # 7. ENDPOINTS TABLE
+    # ═══════════════════════════════════════
+
+    doc.add_heading('7. Зведена таблиця ендпоінтів', level=1)
+
+    add_paragraph(
+        'Базовий URL: https://n8n.rnd.webpromo.tools', bold=True
+    )
+
+    add_table(
+        ['Ендпоінт', 'Метод', 'Воркфлоу', 'GAS-функція'],
+        [
+            ['/webhook/seo-organic-traffic-v74', 'POST', 'Sheet 8 - Traffic Pages', 'submitAudit()'],
+            ['/webhook/browse-ai-callback-v74', 'POST', 'Sheet 8 - Traffic Pages', '(внутрішній callback)'],
+            ['/webhook/seo-audit-full-v74', 'POST', 'Sheet 8 - Traffic Pages', '(внутрішній тригер)'],
+            ['/webhook/analiz-domenu', 'POST', 'Analiz_Domenu_Master', 'submitAnalizDomenu()'],
+            ['/webhook/bulk-domain-audit', 'POST', 'Bulk_Domain_Audit', 'submitBulkAudit()'],
+            ['/webhook-test/seo-audit-ai-report', 'POST', 'SEO_Audit_AI_Report', 'submitAIAnalysis()'],
+            ['/webhook-test/parse-pdf-audit', 'POST', 'PDF_Audit_Parser', 'submitPdfAuditParse()'],
+            ['/webhook/gkp-ideas', 'POST', 'GKP_Universal_System', 'submitGKP(), submitGKPIdeas()'],
+            ['/webhook/gkp-metrics', 'POST', 'GKP_Universal_System', 'submitGKPMetrics()'],
+            ['/webhook/pagespeed-test', 'POST', 'PageSpeed_Test', 'submitPageSpeedTest()'],
+            ['/webhook/link-profile-audit', 'POST', 'Zovnishnya_skladova', '(немає GAS-форми)'],
+            ['/webhook/job-update', 'POST', 'Job_Status_API', '(внутрішній: прогрес завдань)'],
+            ['/webhook/job?id={job_id}', 'GET', 'Job_Status_API', 'getJobStatus()'],
+            ['/webhook/cache-get', 'POST', 'Response_Cache', '(внутрішній: пошук у кеші)'],
+            ['/webhook/cache-put', 'POST', 'Response_Cache', '(внутрішній: запис у кеш)'],
+            ['/webhook/cache-stats', 'GET', 'Response_Cache', '(моніторинг hit/miss)'],
+            ['/webhook/kw-put', 'POST', 'Keyword_Warehouse', '(внутрішній: запис ключів)'],
+            ['/webhook/kw-query', 'POST', 'Keyword_Warehouse', '(аналітика: сторінки, gap конкурентів)'],
+            ['/webhook/sheet-provision', 'POST', 'Sheet_Templates', '(внутрішній: таблиця з шаблону)'],
+            ['/webhook/audit-enqueue', 'POST', 'Audit_Queue', '(внутрішній: аудит у чергу)'],
+            ['/webhook/audit-part', 'POST', 'Audit_Queue', '(внутрішній: виконання частини)'],
+            ['/webhook/audit-part-done', 'POST', 'Audit_Queue', '(внутрішній: звіт частини, бар\'єр)'],
+        ],
+        col_widths=[5.5, 1.5, 4.5, 5]
+    )
+
+    add_paragraph(
+        'Увага: /webhook-test/ ендпоінти — це тестові вебхуки n8n (активні лише коли воркфлоу '
+        'відкрито в редакторі). /webhook/ — продакшн вебхуки (активні коли воркфлоу активовано).',
+        bold=True, color=RGBColor(0xCC, 0x00, 0x00)
+    )
+
+    # ═══════════════════════════════════════
+    # 8. API CREDENTIALS
+    # ═══════════════════════════════════════
+
+    doc.add_heading('8. Зовнішні API та авторизація', level=1)
+
+    add_table(
+        ['Сервіс', 'Тип авторизації', 'Деталі'],
+        [
+            ['Ahrefs', 'Bearer Token (MCP)', 'Токен у сховищі n8n credentials'],
+            ['Google Ads', 'OAuth2 + Developer Token', 'Customer: 3965207166, Login: 3993420980'],
+            ['Serpstat', 'HTTP Query Auth', 'Через сховище n8n credentials'],
+            ['OpenAI', 'API Key', 'Моделі: gpt-4o (звіти), gpt-4o-mini (PageSpeed)'],
+            ['Google Drive/Sheets/Docs', 'OAuth2', 'Через сховище n8n credentials'],
+            ['PageSpeed Insights', 'API Key', 'Ключ у налаштуваннях воркфлоу'],
+            ['Browse AI', 'HTTP Header Auth', 'Через сховище n8n credentials'],
+            ['Cloudinary', 'API credentials', 'Для завантаження SVG-графіків'],
+            ['SEO Store (Postgres)', 'n8n credentials', 'Спільне сховище воркфлоу; схема - seo_store.sql'],
+        ],
+        col_widths=[4, 4, 8.5]
+    )
+
+    # ═══════════════════════════════════════
+    # 9. DRIVE STRUCTURE
+    # ═══════════════════════════════════════
+
+    doc.add_heading('9. Структура Google Drive', level=1)
+
+    drive_lines = [
+        'Root: SEO - аудит (1A3Ak929G1c4XmZpPtI2FP4glrFE2-Bx2)',
+        '|',
+        '+-- [manager@email.com]/',
+        '|   +-- [domain - 2026-02-16]/',
+        '|       +-- SEO Audit - domain - date.xlsx    (8 листів)',
+        '|       +-- GKP Ideas - date.xlsx',
+        '|       +-- GKP Metrics - date.xlsx',
+        '|       +-- PageSpeed Report - date.xlsx',
+        '|       +-- SEO Audit AI Report - domain.gdoc',
+        '|',
+        '+-- Link Profile (окрема папка: 1VAwG8CkWIkhY...)',
+        '    +-- [domain - date]/',
+        '        +-- Link Profile Report.xlsx            (4 листи)',
+        '',
+        'My Drive: [Шаблон] <тип> v<версія>          (шаблони Sheet Templates, створюються автоматично)',
     ]
-)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Отримує домен -> створює Google Sheet -> переміщує у папку на Drive')
-add_bullet('2. Запускає Browse AI для скрапінгу SimilarWeb (трафік, канали, пристрої, соцмережі)')
-add_bullet('3. Відразу повертає URL таблиці (асинхронна обробка)')
-add_bullet('4. Browse AI callback записує поведінкові дані у Лист 1')
-add_bullet('5. Запускає Full Audit внутрішнім вебхуком')
-add_bullet('6. Паралельні виклики Ahrefs API (через MCP): трафік, беклінки, DR, реф-домени, анкори')
-add_bullet('7. Виклики Serpstat API: ключові слова з позиціями (до 5000, з пагінацією)')
-
-add_paragraph('Згенеровані листи:', bold=True)
-add_table(
-    ['Лист №', 'Назва', 'Джерело даних', 'Зміст'],
-    [
-        ['1', 'Органічний_трафік', 'Ahrefs + SimilarWeb', 'Огляд трафіку, історія, гео-розподіл, канали'],
-        ['2', '(вбудований у Лист 1)', 'SimilarWeb / Browse AI', 'Брендовий vs небрендовий трафік, метрики залученості'],
-        ['3', 'Посилальний_профіль', 'Ahrefs', 'Історія DR, реф-домени, розподіл анкорів'],
-        ['4', 'Всі_беклінки', 'Ahrefs', 'Усі беклінки (топ-100 за DR)'],
-        ['5', 'Топ_сторінки_за_посиланнями', 'Ahrefs', 'Топ сторінок за кількістю реф-доменів'],
-        ['6', 'Поведінкові_метрики', 'SimilarWeb / Browse AI', 'Соцтрафік, реферери, видавці'],
-        ['7', 'Ключові_фрази', 'Serpstat', 'До 5000 ключів з обсягами, позиціями, інтентом'],
-        ['8', 'Трафікогенеруючі_сторінки', 'Serpstat (агреговано)', 'Сторінки згруповані за трафіком з топ-ключем'],
-    ],
-    col_widths=[1.5, 4.5, 3.5, 7]
-)
-
-add_paragraph('Зовнішні API:', bold=True)
-add_bullet('Ahrefs (MCP протокол) — метрики домену, беклінки, анкори, DR')
-add_bullet('SimilarWeb (через Browse AI скрапінг) — поведінкові метрики')
-add_bullet('Serpstat API (api.serpstat.com/v4) — ключові слова')
-add_bullet('Cloudinary — хостинг SVG-графіків')
-add_bullet('Google Drive / Sheets API — управління файлами')
-
-add_paragraph('Вхідні параметри:', bold=True)
-add_code_block('{ "domain": "example.com (обов\'язково)", "country": "ua (за замовч.)", "top_pages_limit": 50 }')
-
-# 6.2
-doc.add_heading('6.2. Мастер-оркестратор "Аналіз домену"', level=2)
-add_paragraph('Файл: Analiz_Domenu_Master.json', italic=True, color=GRAY)
-add_paragraph('Webhook: POST /webhook/analiz-domenu', italic=True, color=GRAY)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Отримує email менеджера + опціональні блоки аналізу')
-add_bullet('2. Шукає / створює персональну папку менеджера на Google Drive')
-add_bullet('3. Створює підпапку проекту "{домен} - {дата}"')
-add_bullet('4. Послідовно запускає обрані блоки:')
-add_bullet('Аудит домену клієнта (викликає seo-organic-traffic-v74)', level=1)
-add_bullet('Аудит конкурентів (цикл з затримкою 5 сек на кожного)', level=1)
-add_bullet('Розширення семантики (викликає gkp-ideas)', level=1)
-add_bullet('Збір метрик (викликає gkp-metrics)', level=1)
-add_bullet('PageSpeed тест (викликає pagespeed-test)', level=1)
-add_bullet('5. Переміщує всі згенеровані файли у папку проекту')
-add_bullet('6. Повертає URL папки + статус кожного блоку')
-
-# 6.3
-doc.add_heading('6.3. AI-генератор звіту', level=2)
-add_paragraph('Файл: SEO_Audit_AI_Report.json', italic=True, color=GRAY)
-add_paragraph('Webhook: POST /webhook-test/seo-audit-ai-report', italic=True, color=GRAY)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Отримує URL / ID таблиці')
-add_bullet('2. Зчитує всі 6 листів даних через Google Sheets API batchGet')
-add_bullet('3. Запускає 6 паралельних GPT-4o агентів — кожен аналізує один лист:')
-add_bullet('Агент 1: Аналіз органічного трафіку', level=1)
-add_bullet('Агент 2: Аналіз посилального профілю', level=1)
-add_bullet('Агент 3: Топ сторінки за посиланнями', level=1)
-add_bullet('Агент 4: Поведінкові метрики', level=1)
-add_bullet('Агент 5: Аналіз ключових слів', level=1)
-add_bullet('Агент 6: Трафікогенеруючі сторінки', level=1)
-add_bullet('4. Об\'єднує результати всіх 6 агентів')
-add_bullet('5. Запускає Summary Agent — створює резюме з усіх секцій')
-add_bullet('6. Створює Google Doc з форматуванням (шрифти Montserrat/Open Sans, navy/gold кольори)')
-add_bullet('7. Переміщує документ до папки таблиці-джерела')
-add_paragraph('Результат: URL Google Doc з форматованим AI-звітом', bold=True)
-
-# 6.4
-doc.add_heading('6.4. PDF Audit Parser', level=2)
-add_paragraph('Файл: PDF_Audit_Parser.json', italic=True, color=GRAY)
-add_paragraph('Webhook: POST /webhook-test/parse-pdf-audit', italic=True, color=GRAY)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Отримує URL PDF-файлу з Google Drive')
-add_bullet('2. Завантажує PDF з Google Drive')
-add_bullet('3. Завантажує PDF до OpenAI Files API')
-add_bullet('4. Надсилає до GPT-4o зі структурованим промптом (temperature: 0.1)')
-add_bullet('5. Видобуває 15 секцій: General Info, Summary, Content Types, URL Structure, Server Codes, Indexability, Meta Robots, Canonical, URL Depth, Loading Speed, Protocols, SEO Elements, Content Metrics, Errors, Scan Settings')
-add_bullet('6. Створює нову Google-таблицю з відформатованими даними')
-add_bullet('7. Застосовує форматування: секційні заголовки (темно-сині), підзаголовки (блакитні), заголовки таблиць (сірі)')
-add_bullet('8. Видаляє тимчасовий файл з OpenAI')
-add_bullet('9. Повертає URL таблиці')
-
-add_paragraph('Вхід: { "pdfUrl": "Google Drive URL" }', bold=True)
-add_paragraph('Вихід: { "spreadsheetUrl", "totalRows", "processingTime" }', bold=True)
-
-# 6.5
-doc.add_heading('6.5. GKP Universal System (семантика)', level=2)
-add_paragraph('Файл: GKP_Universal_System.json', italic=True, color=GRAY)
-
-add_table(
-    ['Webhook', 'Призначення'],
-    [
-        ['gkp-ideas', 'Етап 1 — генерація ідей ключових слів із seed-фраз'],
-        ['gkp-metrics', 'Етап 2 — отримання обсягів пошуку для конкретних ключів'],
+    for line in drive_lines:
+        add_code_block(line)
+
+    # ═══════════════════════════════════════
+    # 10. FILE STRUCTURE
+    # ═══════════════════════════════════════
+
+    doc.add_heading('10. Структура файлів у репозиторії', level=1)
+
+    files_lines = [
+        'n8n_seo_audit/',
+        '|-- .mcp.json                              # MCP-сервер конфіг для n8n',
+        '|-- gas/',
+        '|   |-- Код.gs                             # Бекенд: маршрутизація + webhook-проксі',
+        '|   |-- form.html                          # Сторінка: "Аналіз домену"',
+        '|   |-- analiz_domenu_form.html            # Сторінка: "Мастер" оркестратор',
+        '|   |-- bulk_audit_form.html               # Сторінка: Bulk аудит доменів',
+        '|   |-- gkp_form.html                      # Сторінка: GKP legacy',
+        '|   |-- gkp_ideas.html                     # Сторінка: GKP Етап 1',
+        '|   |-- gkp_metrics.html                   # Сторінка: GKP Етап 2',
+        '|   |-- pagespeed_form.html                # Сторінка: PageSpeed тест',
+        '|   |-- pdf_audit_form.html                # Сторінка: AI-аналіз + PDF парсер',
+        '|',
+        '|-- Analiz_Domenu_Master.json              # n8n: Мастер-оркестратор',
+        '|-- Bulk_Domain_Audit.json                 # n8n: Bulk-порівняння доменів (Ahrefs batch-analysis)',
+        '|-- SEO_Audit_AI_Report.json               # n8n: AI-генератор звіту (GPT-4o)',
+        '|-- PDF_Audit_Parser.json                  # n8n: PDF -> таблиця парсер',
+        '|-- GKP_Universal_System.json              # n8n: Google Keyword Planner',
+        '|-- PageSpeed_Test.json                    # n8n: PageSpeed Insights тест',
+        '|-- Sheet 8 - Traffic Pages Nodes (1).json # n8n: Основний SEO-аудит',
+        '|-- Zovnishnya_skladova.json               # n8n: Аудит посилального профілю',
+        '|-- Job_Status_API.json                    # n8n: Статуси асинхронних завдань',
+        '|-- Response_Cache.json                    # n8n: Кеш відповідей Ahrefs / Serpstat',
+        '|-- Keyword_Warehouse.json                 # n8n: Склад ключів Serpstat / GKP (SEO Store)',
+        '|-- Sheet_Templates.json                   # n8n: Таблиці з версійованих шаблонів (files.copy)',
+        '|-- Audit_Queue.json                       # n8n: Черга частин основного аудиту (Postgres, оренди)',
+        '|-- Audit_Fetch.json                       # n8n: Sub-workflow збору однієї частини аудиту',
+        '|-- Rate_Limiter.json                      # n8n: Sub-workflow token bucket для викликів API',
+        '|-- Ahrefs_Decode.json                     # n8n: Sub-workflow відповіді Ahrefs -> компактні таблиці',
+        '|-- To GKP.json                            # n8n: Тестовий воркфлоу',
+        '|-- seo_store.sql                          # Схема SEO Store (Postgres): кеш відповідей, історичні ряди, черга аудитів, бюджети API, асинхронні завдання, реєстри аудитів і шаблонів',
+        '|-- bench_workflows.py                     # Бенчмарк: час по вузлах, пропускна здатність, пам\'ять, mock API',
+        '|-- report_renderer.py                     # Рендер .docx: AI-звіт (CLI + API, пакетно) і хелпери документації',
+        '|-- telemetry_exporter.py                  # Телеметрія виконань: трейси JSON + метрики Prometheus',
+        '|-- bench_pagespeed.py                     # Бенчмарк: пам\'ять на URL - повна відповідь PageSpeed vs fields= vs запис',
+        '|-- bench_tables.py                        # Бенчмарк: add_table vs add_bulk_table (100 / 1k рядків)',
+        '|-- generate_doc.py                        # Генерація цієї документації (python3 generate_doc.py -o ...)',
     ]
-)
-
-add_paragraph('Етап 1 (Генерація ідей):', bold=True)
-add_bullet('Зчитує seed-фрази з Google Sheet (колонка A) або тіла запиту')
-add_bullet('Розбиває на батчі по 10 фраз')
-add_bullet('Викликає Google Ads API generateKeywordIdeas з пагінацією (1000/сторінка)')
-add_bullet('Дедуплікує, сортує за обсягом пошуку')
-add_bullet('Записує у нову таблицю: [Ключове слово, Обсяг пошуку, Конкуренція, Індекс конкуренції, Seed-фраза]')
-
-add_paragraph('Етап 2 (Метрики):', bold=True)
-add_bullet('Зчитує ключові слова з Google Sheet або тіла запиту (до 100 000)')
-add_bullet('Розбиває на батчі по 10 000')
-add_bullet('Викликає Google Ads API generateKeywordHistoricalMetrics')
-add_bullet('Записує: [Ключове слово, Обсяг, Конкуренція, Індекс, Помісячні обсяги]')
-
-# 6.6
-doc.add_heading('6.6. PageSpeed Test', level=2)
-add_paragraph('Файл: PageSpeed_Test.json', italic=True, color=GRAY)
-add_paragraph('Webhook: POST /webhook/pagespeed-test', italic=True, color=GRAY)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Зчитує URL-адреси з Google Sheet (колонка A)')
-add_bullet('2. Створює нову таблицю з 4 вкладками: Mobile Results, Desktop Results, Comparison, Recommendations')
-add_bullet('3. Тестує кожен URL через Google PageSpeed Insights API v5 (батчі по 5, затримка 5 сек)')
-add_bullet('4. Метрики: Performance, Accessibility, Best Practices, SEO, FCP, LCP, TBT, CLS, Speed Index, TTI')
-add_bullet('5. Запускає GPT-4o-mini для AI-коментарів до кожної вкладки')
-add_bullet('6. Записує результати з форматуванням')
-
-# 6.7
-doc.add_heading('6.7. Аудит посилального профілю', level=2)
-add_paragraph('Файл: Zovnishnya_skladova.json', italic=True, color=GRAY)
-add_paragraph('Webhook: POST /webhook/link-profile-audit', italic=True, color=GRAY)
-
-add_paragraph('Потік даних:', bold=True)
-add_bullet('1. Створює папку на Google Drive')
-add_bullet('2. Створює Google Sheet з 4 вкладками')
-add_bullet('3. Паралельні виклики Ahrefs API (MCP): DR, статистика беклінків, анкори (топ-50), топ сторінки (100), всі беклінки (до 5000)')
-add_bullet('4. Записує та форматує 4 листи:')
-add_bullet('Link Profile (DR, ранг, статистика беклінків)', level=1)
-add_bullet('Anchor List (топ-50 анкорів з %)', level=1)
-add_bullet('Top Pages (100 сторінок за реф-доменами)', level=1)
-add_bullet('All Backlinks (до 5000, відсортовано за трафіком)', level=1)
-
-# ═══════════════════════════════════════
-# 7. ENDPOINTS TABLE
-# ═══════════════════════════════════════
-
-doc.add_heading('7. Зведена таблиця ендпоінтів', level=1)
-
-add_paragraph(
-    'Базовий URL: https://n8n.rnd.webpromo.tools', bold=True
-)
-
-add_table(
-    ['Ендпоінт', 'Метод', 'Воркфлоу', 'GAS-функція'],
-    [
-        ['/webhook/seo-organic-traffic-v74', 'POST', 'Sheet 8 - Traffic Pages', 'submitAudit()'],
-        ['/webhook/browse-ai-callback-v74', 'POST', 'Sheet 8 - Traffic Pages', '(внутрішній callback)'],
-        ['/webhook/seo-audit-full-v74', 'POST', 'Sheet 8 - Traffic Pages', '(внутрішній тригер)'],
-        ['/webhook/analiz-domenu', 'POST', 'Analiz_Domenu_Master', 'submitAnalizDomenu()'],
-        ['/webhook-test/seo-audit-ai-report', 'POST', 'SEO_Audit_AI_Report', 'submitAIAnalysis()'],
-        ['/webhook-test/parse-pdf-audit', 'POST', 'PDF_Audit_Parser', 'submitPdfAuditParse()'],
-        ['/webhook/gkp-ideas', 'POST', 'GKP_Universal_System', 'submitGKP(), submitGKPIdeas()'],
-        ['/webhook/gkp-metrics', 'POST', 'GKP_Universal_System', 'submitGKPMetrics()'],
-        ['/webhook/pagespeed-test', 'POST', 'PageSpeed_Test', 'submitPageSpeedTest()'],
-        ['/webhook/link-profile-audit', 'POST', 'Zovnishnya_skladova', '(немає GAS-форми)'],
-    ],
-    col_widths=[5.5, 1.5, 4.5, 5]
-)
-
-add_paragraph(
-    'Увага: /webhook-test/ ендпоінти — це тестові вебхуки n8n (активні лише коли воркфлоу '
-    'відкрито в редакторі). /webhook/ — продакшн вебхуки (активні коли воркфлоу активовано).',
-    bold=True, color=RGBColor(0xCC, 0x00, 0x00)
-)
-
-# ═══════════════════════════════════════
-# 8. API CREDENTIALS
-# ═══════════════════════════════════════
-
-doc.add_heading('8. Зовнішні API та авторизація', level=1)
-
-add_table(
-    ['Сервіс', 'Тип авторизації', 'Деталі'],
-    [
-        ['Ahrefs', 'Bearer Token (MCP)', 'Токен у сховищі n8n credentials'],
-        ['Google Ads', 'OAuth2 + Developer Token', 'Customer: 3965207166, Login: 3993420980'],
-        ['Serpstat', 'HTTP Query Auth', 'Через сховище n8n credentials'],
-        ['OpenAI', 'API Key', 'Моделі: gpt-4o (звіти), gpt-4o-mini (PageSpeed)'],
-        ['Google Drive/Sheets/Docs', 'OAuth2', 'Через сховище n8n credentials'],
-        ['PageSpeed Insights', 'API Key', 'Ключ у налаштуваннях воркфлоу'],
-        ['Browse AI', 'HTTP Header Auth', 'Через сховище n8n credentials'],
-        ['Cloudinary', 'API credentials', 'Для завантаження SVG-графіків'],
-    ],
-    col_widths=[4, 4, 8.5]
-)
-
-# ═══════════════════════════════════════
-# 9. DRIVE STRUCTURE
-# ═══════════════════════════════════════
-
-doc.add_heading('9. Структура Google Drive', level=1)
-
-drive_lines = [
-    'Root: SEO - аудит (1A3Ak929G1c4XmZpPtI2FP4glrFE2-Bx2)',
-    '|',
-    '+-- [manager@email.com]/',
-    '|   +-- [domain - 2026-02-16]/',
-    '|       +-- SEO Audit - domain - date.xlsx    (8 листів)',
-    '|       +-- GKP Ideas - date.xlsx',
-    '|       +-- GKP Metrics - date.xlsx',
-    '|       +-- PageSpeed Report - date.xlsx',
-    '|       +-- SEO Audit AI Report - domain.gdoc',
-    '|',
-    '+-- Link Profile (окрема папка: 1VAwG8CkWIkhY...)',
-    '    +-- [domain - date]/',
-    '        +-- Link Profile Report.xlsx            (4 листи)',
-]
-for line in drive_lines:
-    add_code_block(line)
-
-# ═══════════════════════════════════════
-# 10. FILE STRUCTURE
-# ═══════════════════════════════════════
-
-doc.add_heading('10. Структура файлів у репозиторії', level=1)
-
-files_lines = [
-    'n8n_seo_audit/',
-    '|-- .mcp.json                              # MCP-сервер конфіг для n8n',
-    '|-- gas/',
-    '|   |-- Код.gs                             # Бекенд: маршрутизація + webhook-проксі',
-    '|   |-- form.html                          # Сторінка: "Аналіз домену"',
-    '|   |-- analiz_domenu_form.html            # Сторінка: "Мастер" оркестратор',
-    '|   |-- gkp_form.html                      # Сторінка: GKP legacy',
-    '|   |-- gkp_ideas.html                     # Сторінка: GKP Етап 1',
-    '|   |-- gkp_metrics.html                   # Сторінка: GKP Етап 2',
-    '|   |-- pagespeed_form.html                # Сторінка: PageSpeed тест',
-    '|   |-- pdf_audit_form.html                # Сторінка: AI-аналіз + PDF парсер',
-    '|',
-    '|-- Analiz_Domenu_Master.json              # n8n: Мастер-оркестратор',
-    '|-- SEO_Audit_AI_Report.json               # n8n: AI-генератор звіту (GPT-4o)',
-    '|-- PDF_Audit_Parser.json                  # n8n: PDF -> таблиця парсер',
-    '|-- GKP_Universal_System.json              # n8n: Google Keyword Planner',
-    '|-- PageSpeed_Test.json                    # n8n: PageSpeed Insights тест',
-    '|-- Sheet 8 - Traffic Pages Nodes (1).json # n8n: Основний SEO-аудит',
-    '|-- Zovnishnya_skladova.json               # n8n: Аудит посилального профілю',
-    '|-- To GKP.json                            # n8n: Тестовий воркфлоу',
-]
-for line in files_lines:
-    add_code_block(line)
-
-# ═══════════════════════════════════════
-# 11. DEPLOYMENT NOTES
-# ═══════════════════════════════════════
-
-doc.add_heading('11. Нотатки щодо деплою', level=1)
-
-doc.add_heading('GAS деплой', level=3)
-add_bullet('Код знаходиться в редакторі GAS (посилання у розділі 2)')
-add_bullet('Git-репозиторій є дзеркалом GAS-файлів для контролю версій')
-add_bullet('Для деплою: скопіювати файли з gas/ у GAS-редактор -> Deploy as Web App')
-add_bullet('URL Web App вбудований як iframe у Google Sites сторінку')
-
-doc.add_heading('n8n деплой', level=3)
-add_bullet('JSON-файли в репозиторії — це експорти n8n воркфлоу')
-add_bullet('Для деплою: імпортувати JSON у n8n інстанс (n8n.rnd.webpromo.tools)')
-add_bullet('Після імпорту: налаштувати credentials, активувати воркфлоу')
-
-add_paragraph(
-    'ВАЖЛИВО: /webhook-test/ URL працюють ЛИШЕ коли воркфлоу відкрито в редакторі n8n. '
-    'Для продакшну потрібно змінити на /webhook/ та активувати воркфлоу.',
-    bold=True, color=RGBColor(0xCC, 0x00, 0x00)
-)
-
-doc.add_heading('Поточний стан webhook-test', level=3)
-add_paragraph(
-    'Дві функції (submitAIAnalysis, submitPdfAuditParse) зараз вказують на webhook-test URL. '
-    'Це означає, що вони працюватимуть тільки коли відповідні воркфлоу відкриті в редакторі n8n. '
-    'Для продакшну: змінити на /webhook/ та активувати воркфлоу.'
-)
-
-# ── SAVE ──
-output_path = '/home/user/n8n_seo_audit/SEO_Audit_Platform_Documentation.docx'
-doc.save(output_path)
-print(f'Document saved to: {output_path}')
+    for line in files_lines:
+        add_code_block(line)
+
+    # ═══════════════════════════════════════
+    # 11. DEPLOYMENT NOTES
+    # ═══════════════════════════════════════
+
+    doc.add_heading('11. Нотатки щодо деплою', level=1)
+
+    doc.add_heading('GAS деплой', level=3)
+    add_bullet('Код знаходиться в редакторі GAS (посилання у розділі 2)')
+    add_bullet('Git-репозиторій є дзеркалом GAS-файлів для контролю версій')
+    add_bullet('Для деплою: скопіювати файли з gas/ у GAS-редактор -> Deploy as Web App')
+    add_bullet('URL Web App вбудований як iframe у Google Sites сторінку')
+
+    doc.add_heading('n8n деплой', level=3)
+    add_bullet('JSON-файли в репозиторії — це експорти n8n воркфлоу')
+    add_bullet('Для деплою: імпортувати JSON у n8n інстанс (n8n.rnd.webpromo.tools)')
+    add_bullet('Після імпорту: налаштувати credentials, активувати воркфлоу')
+    add_bullet('SEO Store: перед імпортом застосувати схему - psql "$SEO_STORE_URL" -f seo_store.sql '
+               '(ідемпотентно, повторювати після кожного оновлення файлу)')
+    add_bullet('Job Status API (Job_Status_API_001) вказаний як errorWorkflow у мастері, Bulk, PageSpeed, PDF і AI Report - '
+               'імпортувати його під цим id')
+
+    doc.add_heading('Телеметрія виконань', level=3)
+    add_bullet('telemetry_exporter.py читає виконання всіх воркфлоу репозиторію (основні та службові: Audit Queue/Fetch, Rate Limiter, Ahrefs Decode, Response Cache тощо) через n8n public API (includeData=true)')
+    add_bullet('По кожному вузлу: старт/кінець, items, байти виходу, зовнішні виклики, кредити Ahrefs/Serpstat, токени OpenAI')
+    add_bullet('Вихід: JSON-трейс на виконання (--traces) і метрики Prometheus (--prom для node_exporter або --serve /metrics)')
+    add_bullet('Стан (оброблені виконання і лічильники) - ~/.local/state/seo-audit/telemetry_state.json '
+               '($XDG_STATE_HOME), інший шлях - --state')
+    add_bullet('idle_ms у трейсі - час поза вузлами (черга, відновлення після Wait); EXECUTIONS_DATA_SAVE_ON_SUCCESS=all обов\'язковий')
+
+    add_paragraph(
+        'ВАЖЛИВО: /webhook-test/ URL працюють ЛИШЕ коли воркфлоу відкрито в редакторі n8n. '
+        'Для продакшну потрібно змінити на /webhook/ та активувати воркфлоу.',
+        bold=True, color=RGBColor(0xCC, 0x00, 0x00)
+    )
+
+    doc.add_heading('Поточний стан webhook-test', level=3)
+    add_paragraph(
+        'Дві функції (submitAIAnalysis, submitPdfAuditParse) зараз вказують на webhook-test URL. '
+        'Це означає, що вони працюватимуть тільки коли відповідні воркфлоу відкриті в редакторі n8n. '
+        'Для продакшну: змінити на /webhook/ та активувати воркфлоу.'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', default=os.path.join(ROOT, 'SEO_Audit_Platform_Documentation.docx'))
+    args = parser.parse_args()
+
+    builder = DocBuilder()
+    build_documentation(builder)
+    builder.save(args.output)
+    print(f'Document saved to: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""Render branded .docx documents: shared python-docx toolkit plus the SEO audit AI report template.
+
+Приклад:
+    python3 report_renderer.py sections.json -o report.docx
+    python3 report_renderer.py reports/*.json --out-dir out --workers 4
+
+Вхід - JSON з виходом Collect Sections (SEO_Audit_AI_Report.json) і текстом
+Final Summary Agent у полі finalSummary. Файл може містити один об'єкт,
+список об'єктів або items n8n ({"json": {...}}). Звіт будується за один
+локальний прохід, без Google Docs API; кілька файлів рендеряться паралельно
+в пулі процесів.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Cm, Emu, Pt, RGBColor
+from docx.table import Table
+
+# ── Кольори технічної документації (generate_doc.py) ──
+NAVY = RGBColor(0x1B, 0x3A, 0x57)
+DARK = RGBColor(0x33, 0x33, 0x33)
+GRAY = RGBColor(0x66, 0x66, 0x66)
+LINK_BLUE = RGBColor(0x1A, 0x73, 0xE8)
+WHITE = RGBColor(0xFF, 0xFF, 0xFF)
+
+# ── Бренди: шрифти і кольори (hex без #) ──
+DOC_BRAND = {
+    'body_font': 'Arial',
+    'heading_font': 'Arial',
+    'body_size': 11,
+    'heading': '1B3A57',
+    'subheading': '1B3A57',
+    'accent': '1B3A57',
+    'text': None,  # колір Normal за замовч. Word
+    'muted': '666666',
+    'light': '999999',
+    'stripe': 'F0F4F8',
+    'code': 'F5F5F5',
+}
+
+# Палітра та шрифти звіту - ті самі, що застосовував Build Format Requests у Google Doc
+REPORT_BRAND = {
+    **DOC_BRAND,
+    'body_font': 'Open Sans',
+    'heading_font': 'Montserrat',
+    'heading': '1A264D',     # navy
+    'subheading': '264073',  # dark blue
+    'accent': 'BF9933',      # gold
+    'text': '262626',
+    'footer': 'Конфіденційний документ  •  {domain}  •  {date}',
+}
+
+# ── Шаблон звіту: номер, пункт змісту, заголовок, поле Collect Sections ──
+REPORT_SECTIONS = [
+    ('01', 'Executive Summary', 'EXECUTIVE SUMMARY', 'finalSummary'),
+    ('02', 'Органічний трафік', 'ОРГАНІЧНИЙ ТРАФІК', 'section1'),
+    ('03', 'Посилальний профіль', 'ПОСИЛАЛЬНИЙ ПРОФІЛЬ', 'section2'),
+    ('04', 'Топ сторінки за посиланнями', 'ТОП СТОРІНКИ ЗА ПОСИЛАННЯМИ', 'section3'),
+    ('05', 'Поведінкові метрики', 'ПОВЕДІНКОВІ МЕТРИКИ', 'section4'),
+    ('06', 'Ключові фрази', 'КЛЮЧОВІ ФРАЗИ', 'section5'),
+    ('07', 'Трафікогенеруючі сторінки', 'ТРАФІКОГЕНЕРУЮЧІ СТОРІНКИ', 'section6'),
+]
+
+RULE = '━' * 40
+BULLET_RE = re.compile(r'^\s*[-•*]\s+')
+
+# Таблиці, довші за це, add_table будує через add_bulk_table
+BULK_TABLE_ROWS = 200
+# ...і парсить їх XML пачками по стільки рядків
+BULK_CHUNK_ROWS = 200
+XML_INVALID_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def rgb(hex_color):
+    return RGBColor.from_string(hex_color.upper())
+
+
+def shade(element, hex_color):
+    element.append(parse_xml(f'<w:shd {nsdecls("w")} w:fill="{hex_color}"/>'))
+
+
+class DocBuilder:
+    """Документ python-docx зі стилями бренду і хелперами блоків (абзац, список, таблиця, код)."""
+
+    def __init__(self, brand=None):
+        self.brand = {**DOC_BRAND, **(brand or {})}
+        self.doc = Document()
+        self._apply_styles()
+
+    def _apply_styles(self):
+        b = self.brand
+        style = self.doc.styles['Normal']
+        style.font.name = b['body_font']
+        style.font.size = Pt(b['body_size'])
+        if b['text']:
+            style.font.color.rgb = rgb(b['text'])
+        style.paragraph_format.space_after = Pt(6)
+        style.paragraph_format.line_spacing = 1.15
+
+        for level in range(1, 4):
+            hs = self.doc.styles[f'Heading {level}']
+            hs.font.name = b['heading_font']
+            hs.font.color.rgb = rgb(b['heading'])
+
+        self.doc.styles['Heading 1'].font.size = Pt(20)
+        self.doc.styles['Heading 2'].font.size = Pt(15)
+        self.doc.styles['Heading 3'].font.size = Pt(12)
+
+    def add_paragraph(self, text, bold=False, italic=False, color=None, size=None, align=None, font=None):
+        p = self.doc.add_paragraph()
+        run = p.add_run(text)
+        run.bold = bold
+        run.italic = italic
+        if color:
+            run.font.color.rgb = color
+        if size:
+            run.font.size = Pt(size)
+        if font:
+            run.font.name = font
+        if align:
+            p.alignment = align
+        return p
+
+    def add_bullet(self, text, level=0):
+        p = self.doc.add_paragraph(text, style='List Bullet')
+        p.paragraph_format.left_indent = Cm(1.27 + level * 1.27)
+        return p
+
+    def add_table(self, headers, rows, col_widths=None, bulk=None):
+        # bulk=None - вибір за кількістю рядків, False - завжди через об'єкти python-docx
+        if bulk or (bulk is None and len(rows) > BULK_TABLE_ROWS):
+            return self.add_bulk_table(headers, rows, col_widths)
+
+        table = self.doc.add_table(rows=1 + len(rows), cols=len(headers))
+        table.style = 'Table Grid'
+        table.alignment = WD_TABLE_ALIGNMENT.LEFT
+
+        # Header row
+        hdr = table.rows[0]
+        for i, h in enumerate(headers):
+            cell = hdr.cells[i]
+            cell.text = ''
+            run = cell.paragraphs[0].add_run(h)
+            run.bold = True
+            run.font.size = Pt(10)
+            run.font.color.rgb = WHITE
+            shade(cell._tc.get_or_add_tcPr(), self.brand['heading'])
+
+        # Data rows
+        for ri, row in enumerate(rows):
+            for ci, val in enumerate(row):
+                cell = table.rows[ri + 1].cells[ci]
+                cell.text = ''
+                run = cell.paragraphs[0].add_run(str(val))
+                run.font.size = Pt(10)
+                # Alternate row shading
+                if ri % 2 == 0:
+                    shade(cell._tc.get_or_add_tcPr(), self.brand['stripe'])
+
+        if col_widths:
+            for i, w in enumerate(col_widths):
+                for row in table.rows:
+                    row.cells[i].width = Cm(w)
+
+        self.doc.add_paragraph()  # spacing
+        return table
+
+    def add_bulk_table(self, headers, rows, col_widths=None):
+        """Та сама таблиця, що й add_table, але XML рядків збирається пачками і кожна парситься одним викликом.
+
+        Властивості клітинок (заливка, ширина) і run-ів - готові фрагменти, спільні для всіх
+        рядків, тож на 10 000 рядків не створюються десятки тисяч об'єктів python-docx.
+        """
+        cols = len(headers)
+        if col_widths:
+            widths = [Cm(w).twips for w in col_widths]
+        else:
+            section = self.doc.sections[-1]
+            usable = Emu(section.page_width - section.left_margin - section.right_margin)
+            widths = [int(usable.twips / cols)] * cols
+        width_xml = ['<w:tcW w:w="%d" w:type="dxa"/>' % w if col_widths else '' for w in widths]
+
+        header_pr = [f'<w:tcPr>{w}<w:shd w:fill="{self.brand["heading"]}"/></w:tcPr>' for w in width_xml]
+        stripe_pr = [f'<w:tcPr>{w}<w:shd w:fill="{self.brand["stripe"]}"/></w:tcPr>' for w in width_xml]
+        plain_pr = [f'<w:tcPr>{w}</w:tcPr>' for w in width_xml]
+        header_rpr = '<w:rPr><w:b/><w:color w:val="FFFFFF"/><w:sz w:val="20"/></w:rPr>'
+        body_rpr = '<w:rPr><w:sz w:val="20"/></w:rPr>'
+
+        def cell(tc_pr, r_pr, value):
+            text = escape(XML_INVALID_RE.sub('', str(value)))
+            text = text.replace('\n', '</w:t><w:br/><w:t xml:space="preserve">')
+            return f'<w:tc>{tc_pr}<w:p><w:r>{r_pr}<w:t xml:space="preserve">{text}</w:t></w:r></w:p></w:tc>'
+
+        tbl = parse_xml(
+            f'<w:tbl {nsdecls("w")}><w:tblPr>'
+            f'<w:tblStyle w:val="{self.doc.styles["Table Grid"].style_id}"/>'
+            '<w:tblW w:type="auto" w:w="0"/><w:jc w:val="left"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+            'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>'
+            + ''.join('<w:gridCol w:w="%d"/>' % w for w in widths)
+            + '</w:tblGrid><w:tr>'
+            + ''.join(cell(header_pr[i], header_rpr, h) for i, h in enumerate(headers))
+            + '</w:tr></w:tbl>'
+        )
+
+        # Рядки парсяться пачками по BULK_CHUNK_ROWS: у пам'яті одночасно лише XML однієї пачки,
+        # а не рядок на всю таблицю поруч із деревом, яке з нього будується
+        for start in range(0, len(rows), BULK_CHUNK_ROWS):
+            parts = [f'<w:tbl {nsdecls("w")}>']
+            for ri in range(start, min(start + BULK_CHUNK_ROWS, len(rows))):
+                row = rows[ri]
+                # Alternate row shading
+                tc_prs = stripe_pr if ri % 2 == 0 else plain_pr
+                parts.append('<w:tr>')
+                parts.extend(cell(tc_prs[ci], body_rpr, row[ci] if ci < len(row) else '') for ci in range(cols))
+                parts.append('</w:tr>')
+            parts.append('</w:tbl>')
+            tbl.extend(list(parse_xml(''.join(parts))))
+
+        self.doc.element.body._insert_tbl(tbl)
+        self.doc.add_paragraph()  # spacing
+        return Table(tbl, self.doc._body)
+
+    def add_code_block(self, text):
+        p = self.doc.add_paragraph()
+        p.paragraph_format.left_indent = Cm(1)
+        run = p.add_run(text)
+        run.font.name = 'Courier New'
+        run.font.size = Pt(9)
+        run.font.color.rgb = DARK
+        shade(p._p.get_or_add_pPr(), self.brand['code'])
+        return p
+
+    def add_rule(self):
+        p = self.add_paragraph(RULE, color=rgb(self.brand['accent']), size=10)
+        p.paragraph_format.space_after = Pt(12)
+        return p
+
+    def save(self, path):
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.doc.save(path)
+        return path
+
+
+# ═══════════════════════════════════════
+# AI REPORT TEMPLATE
+# ═══════════════════════════════════════
+
+def clean_markdown(text):
+    """Те саме очищення, що робив Prepare Document: без #, **, * і горизонтальних ліній."""
+    text = re.sub(r'^#{1,4}\s*', '', text or '', flags=re.M)
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+    text = re.sub(r'^---+$', '', text, flags=re.M)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def is_subheading(line):
+    """Рядок ВЕЛИКИМИ літерами (3-59 символів) - підзаголовок, як у findSubheadings."""
+    return (3 <= len(line) < 60
+            and re.search(r'[А-ЯЇІЄҐA-Z]', line) is not None
+            and re.search(r'[а-яїієґa-z]', line) is None
+            and not line.startswith('━')
+            and re.fullmatch(r'\d+\.', line) is None)
+
+
+def report_summary(report):
+    """Текст Final Summary Agent: окреме поле або вихід вузла OpenAI як є."""
+    summary = report.get('finalSummary') or report.get('summary')
+    if summary:
+        return summary
+    message = report.get('message')
+    if isinstance(message, dict) and message.get('content'):
+        return message['content']
+    return report.get('content') or report.get('text') or ''
+
+
+def report_filename(report):
+    domain = re.sub(r'[^\w.-]+', '_', report.get('domain') or 'report')
+    day = report.get('dateToday') or report.get('date_today') or date.today().isoformat()
+    return f'SEO_Audit_{domain}_{re.sub(r"[^0-9-]+", "-", str(day))}.docx'
+
+
+def render_report(report, output_path=None, brand=None):
+    """Рендерить звіт одного домену у .docx і повертає шлях до файлу."""
+    b = DocBuilder({**REPORT_BRAND, **(brand or {})})
+    doc = b.doc
+    navy = rgb(b.brand['heading'])
+    dark_blue = rgb(b.brand['subheading'])
+    gold = rgb(b.brand['accent'])
+    heading_font = b.brand['heading_font']
+
+    domain = report.get('domain') or ''
+    day = report.get('dateToday') or report.get('date_today') or date.today().isoformat()
+    texts = {key: report.get(key) or '' for _, _, _, key in REPORT_SECTIONS}
+    texts['finalSummary'] = report_summary(report)
+
+    # ── Титульна сторінка ──
+    for _ in range(5):
+        doc.add_paragraph()
+    b.add_paragraph('SEO АУДИТ', bold=True, color=navy, size=36, align=WD_ALIGN_PARAGRAPH.CENTER, font=heading_font)
+    b.add_paragraph(domain.upper(), bold=True, color=gold, size=28, align=WD_ALIGN_PARAGRAPH.CENTER, font=heading_font)
+    b.add_paragraph(str(day), color=rgb(b.brand['muted']), size=14, align=WD_ALIGN_PARAGRAPH.CENTER)
+    doc.add_page_break()
+
+    # ── Зміст ──
+    b.add_paragraph('ЗМІСТ', bold=True, color=navy, size=18, font=heading_font)
+    b.add_rule()
+    for num, toc_title, _, _ in REPORT_SECTIONS:
+        p = doc.add_paragraph()
+        run = p.add_run(num)
+        run.bold = True
+        run.font.name = heading_font
+        run.font.color.rgb = dark_blue
+        p.add_run('     ' + toc_title)
+    doc.add_page_break()
+
+    # ── Секції ──
+    for num, _, title, key in REPORT_SECTIONS:
+        p = b.add_paragraph(num, bold=True, color=gold, size=48, font=heading_font)
+        p.paragraph_format.space_before = Pt(24)
+        p.paragraph_format.space_after = Pt(0)
+        is_exec = key == 'finalSummary'
+        p = b.add_paragraph(title, bold=True, color=navy if is_exec else dark_blue,
+                            size=22 if is_exec else 18, font=heading_font)
+        p.paragraph_format.space_after = Pt(4)
+        b.add_rule()
+
+        for line in clean_markdown(texts[key]).split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if is_subheading(line):
+                p = b.add_paragraph(line, bold=True, color=dark_blue, size=12, font=heading_font)
+                p.paragraph_format.space_before = Pt(18)
+            elif BULLET_RE.match(line):
+                b.add_bullet(BULLET_RE.sub('', line))
+            else:
+                p = b.add_paragraph(line)
+                p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                p.paragraph_format.line_spacing = 1.5
+        doc.add_page_break()
+
+    # ── Футер на кожній сторінці ──
+    footer = doc.sections[0].footer.paragraphs[0]
+    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = footer.add_run(b.brand['footer'].format(domain=domain, date=day))
+    run.font.size = Pt(10)
+    run.font.color.rgb = rgb(b.brand['light'])
+
+    return b.save(output_path or report_filename(report))
+
+
+def _render_job(job):
+    report, path, brand = job
+    try:
+        return {'domain': report.get('domain'), 'path': render_report(report, path, brand), 'error': None}
+    except Exception as e:  # один зламаний звіт не зупиняє пакет
+        return {'domain': report.get('domain'), 'path': None, 'error': f'{type(e).__name__}: {e}'}
+
+
+def batch_paths(reports, out_dir='.'):
+    """Шляхи пакета без колізій: той самий домен і дата або вже наявний файл -> суфікс _2, _3..."""
+    paths, taken = [], set()
+    for report in reports:
+        stem, ext = os.path.splitext(report_filename(report))
+        path, n = os.path.join(out_dir, stem + ext), 1
+        while os.path.normcase(path) in taken or os.path.exists(path):
+            n += 1
+            path = os.path.join(out_dir, f'{stem}_{n}{ext}')
+        taken.add(os.path.normcase(path))
+        paths.append(path)
+    return paths
+
+
+def render_batch(reports, out_dir='.', workers=None, brand=None):
+    """Рендерить звіти кількох доменів паралельно (пул процесів); результати - у порядку вхідних."""
+    jobs = [(r, path, brand) for r, path in zip(reports, batch_paths(reports, out_dir))]
+    if len(jobs) <= 1 or workers == 1:
+        return [_render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_job, jobs))
+
+
+def load_reports(path):
+    """Об'єкт, список або items n8n -> список словників звітів."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    items = data if isinstance(data, list) else [data]
+    return [item['json'] if isinstance(item.get('json'), dict) else item for item in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='JSON-файли з виходом Collect Sections + finalSummary')
+    parser.add_argument('-o', '--output', help='шлях .docx (лише коли на вході один звіт)')
+    parser.add_argument('--out-dir', default='.', help='папка для пакетного рендеру')
+    parser.add_argument('--workers', type=int, help='процесів у пулі (за замовч. - кількість CPU)')
+    parser.add_argument('--brand', help='JSON або шлях до .json з перевизначенням кольорів/шрифтів')
+    args = parser.parse_args()
+
+    brand = None
+    if args.brand:
+        text = open(args.brand).read() if os.path.exists(args.brand) else args.brand
+        brand = json.loads(text)
+
+    reports = [r for path in args.inputs for r in load_reports(path)]
+    if args.output:
+        if len(reports) != 1:
+            parser.error('-o працює лише з одним звітом, для кількох - --out-dir')
+        print(f'Збережено: {render_report(reports[0], args.output, brand)}')
+        return
+
+    failed = 0
+    for result in render_batch(reports, args.out_dir, args.workers, brand):
+        if result['error']:
+            failed += 1
+            print(f"  {result['domain']}: помилка - {result['error']}")
+        else:
+            print(f"  {result['domain']}: {result['path']}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
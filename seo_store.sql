@@ -0,0 +1,201 @@
+-- ============================================
+-- SEO STORE - спільне сховище воркфлоу (Postgres)
+-- Застосувати перед імпортом воркфлоу: psql "$SEO_STORE_URL" -f seo_store.sql
+-- Скрипт ідемпотентний - повторний запуск лише додає нові таблиці і оновлює бюджети API
+-- ============================================
+
+-- ---------- Response Cache (cache-get / cache-put / cache-stats) ----------
+-- Один рядок на відповідь: запис не переписує інші записи, TTL - expires_at.
+-- Понад бюджет байтів (Cache Key) запис витісняє найдавніше прочитані рядки (LRU)
+CREATE TABLE IF NOT EXISTS response_cache (
+  key               text PRIMARY KEY,      -- namespace | endpoint | params | date
+  namespace         text NOT NULL,
+  value             jsonb NOT NULL,
+  size_bytes        integer NOT NULL,
+  stored_at         timestamptz NOT NULL DEFAULT now(),
+  expires_at        timestamptz NOT NULL,
+  last_accessed_at  timestamptz NOT NULL DEFAULT now()
+);
+ALTER TABLE response_cache ADD COLUMN IF NOT EXISTS last_accessed_at timestamptz NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS response_cache_expires_at ON response_cache (expires_at);
+CREATE INDEX IF NOT EXISTS response_cache_last_accessed_at ON response_cache (last_accessed_at);
+
+-- Лічильники hit/miss: атомарний інкремент замість перезапису всього кешу
+CREATE TABLE IF NOT EXISTS response_cache_stats (
+  namespace  text PRIMARY KEY,
+  hits       bigint NOT NULL DEFAULT 0,
+  misses     bigint NOT NULL DEFAULT 0
+);
+
+-- ---------- History Store (Audit Fetch: History Load / History Save) ----------
+-- Історичні ряди Ahrefs між аудитами: рядок на (домен, ряд), точки - об'єкт дата -> компактний рядок
+CREATE TABLE IF NOT EXISTS history_series (
+  domain      text NOT NULL,
+  field       text NOT NULL,                  -- metrics | pages | domain_ratings | refdomains
+  tool        text NOT NULL,
+  columns     jsonb NOT NULL,
+  points      jsonb NOT NULL,
+  from_date   date NOT NULL,                  -- ряд повний починаючи з цієї дати
+  last_date   date,
+  to_date     date NOT NULL,                  -- верхня межа вже запитаного періоду
+  full_at     timestamptz NOT NULL,           -- останнє повне перезавантаження
+  updated_at  timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (domain, field)
+);
+CREATE INDEX IF NOT EXISTS history_series_updated_at ON history_series (updated_at);
+
+-- ---------- Spill Store (Audit Fetch: Serpstat; GKP Ideas) ----------
+-- Проміжні дані циклів пагінації під ключем запуску (<джерело>:<id виконання>):
+-- між ітераціями цикл передає лише ключ і лічильники. Залишки впалих запусків
+-- (старші за 6 год) прибирає наступний запис
+CREATE TABLE IF NOT EXISTS spill_pages (
+  spill_key   text NOT NULL,
+  seq         integer NOT NULL,               -- номер сторінки
+  data        jsonb NOT NULL,
+  created_at  timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (spill_key, seq)
+);
+CREATE INDEX IF NOT EXISTS spill_pages_created_at ON spill_pages (created_at);
+
+-- Обмежений top-K (GKP Ideas): рядок на ключове слово, хвиля зливається одним запитом
+CREATE TABLE IF NOT EXISTS spill_topk (
+  spill_key   text NOT NULL,
+  item_key    text NOT NULL,
+  rank_a      integer NOT NULL,               -- менше - краще (competition: HIGH = 0)
+  rank_b      bigint NOT NULL,                -- більше - краще (avgMonthlySearches)
+  data        jsonb NOT NULL,
+  created_at  timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (spill_key, item_key)
+);
+CREATE INDEX IF NOT EXISTS spill_topk_created_at ON spill_topk (created_at);
+
+-- ---------- Keyword Warehouse (kw-put / kw-query) ----------
+-- Партиція: source | domain | geo | date (GKP - без домену); рядок на ключ (і URL для Serpstat).
+-- Запис партиції - один запит, витіснення - окремий, тож паралельні записи не гублять партиції
+CREATE TABLE IF NOT EXISTS kw_partitions (
+  part_id     bigserial PRIMARY KEY,
+  source      text NOT NULL,                  -- serpstat | gkp
+  domain      text NOT NULL,
+  geo         text NOT NULL,
+  date        date NOT NULL,
+  rows        integer NOT NULL DEFAULT 0,
+  stored_at   timestamptz NOT NULL DEFAULT now(),
+  UNIQUE (source, domain, geo, date)
+);
+
+CREATE TABLE IF NOT EXISTS kw_rows (
+  part_id     bigint NOT NULL REFERENCES kw_partitions ON DELETE CASCADE,
+  keyword     text NOT NULL,                  -- нормалізований: нижній регістр, одинарні пробіли
+  url         text NOT NULL DEFAULT '',       -- Serpstat; у GKP порожній
+  position    real,
+  volume      bigint,
+  traffic     double precision,
+  kd          real,
+  comp        real,                           -- GKP: competition index
+  PRIMARY KEY (part_id, keyword, url)
+);
+CREATE INDEX IF NOT EXISTS kw_rows_keyword ON kw_rows (keyword);
+
+-- ---------- Audit Queue (audit-enqueue / audit-part / audit-part-done) ----------
+-- Запуск аудиту: тіло Full Audit і бар'єр (finalized_at ставиться рівно один раз)
+CREATE TABLE IF NOT EXISTS audit_runs (
+  run_id        text PRIMARY KEY,
+  tenant        text NOT NULL,
+  body          jsonb NOT NULL,
+  parts         text[] NOT NULL,
+  finalized_at  timestamptz,
+  created_at    timestamptz NOT NULL DEFAULT now()
+);
+
+-- Частина запуску - рядок черги. Оренда має дедлайн: прострочена частина
+-- повертається в чергу диспетчером з attempt + 1, після max_attempts - failed
+CREATE TABLE IF NOT EXISTS audit_jobs (
+  run_id        text NOT NULL REFERENCES audit_runs ON DELETE CASCADE,
+  part          text NOT NULL,
+  tenant        text NOT NULL,
+  status        text NOT NULL DEFAULT 'queued',  -- queued | leased | done | failed
+  attempt       integer NOT NULL DEFAULT 1,
+  max_attempts  integer NOT NULL DEFAULT 3,
+  params        jsonb NOT NULL,
+  result        jsonb,
+  error         text,
+  enqueued_at   timestamptz NOT NULL DEFAULT now(),
+  leased_at     timestamptz,                     -- остання видача частини - для round-robin
+  lease_until   timestamptz,
+  updated_at    timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (run_id, part)
+);
+CREATE INDEX IF NOT EXISTS audit_jobs_queued ON audit_jobs (part, tenant, enqueued_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS audit_jobs_leased ON audit_jobs (lease_until) WHERE status = 'leased';
+
+-- ---------- Job Status API (job-update / job / Error Trigger) ----------
+-- Асинхронне завдання - рядок на job_id: кожне оновлення - один upsert, тож паралельні
+-- виконання не затирають записи одне одного. Фінальний статус (completed / failed)
+-- ставиться один раз - пізнє оновлення прогресу його вже не змінює
+CREATE TABLE IF NOT EXISTS async_jobs (
+  job_id       text PRIMARY KEY,               -- id виконання n8n або audit-<run_id>
+  type         text,
+  status       text NOT NULL DEFAULT 'queued',  -- queued | running | completed | failed
+  stage        text,
+  progress     jsonb,
+  partial      jsonb NOT NULL DEFAULT '{}',     -- проміжні результати накопичуються
+  result       jsonb,
+  error        text,
+  stale_after  integer,                         -- с без оновлень, після яких етап вважається завислим
+  created_at   timestamptz NOT NULL DEFAULT now(),
+  updated_at   timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS async_jobs_updated_at ON async_jobs (updated_at);
+
+-- ---------- Sheet Templates (sheet-provision) ----------
+-- Реєстр шаблонів: рядок на (тип, версію). Створює шаблон лише той запит, що вставив
+-- рядок-заявку (claimed_by); решта чекають на file_id. Заявка без file_id, старша
+-- за 2 хв, вважається покинутою - її перехоплює наступний запит
+CREATE TABLE IF NOT EXISTS sheet_templates (
+  type        text NOT NULL,
+  version     integer NOT NULL,
+  file_id     text,                            -- NULL - шаблон ще створюється
+  claimed_by  text NOT NULL,                   -- id виконання, що створює шаблон
+  claimed_at  timestamptz NOT NULL DEFAULT now(),
+  created_at  timestamptz,
+  PRIMARY KEY (type, version)
+);
+
+-- ---------- Audit Registry (Sheet 8: Put / Lookup / Resolve / Offset) ----------
+-- Запуск аудиту -> таблиця, sheetId листів і зміщення рядків. Рядок на запуск (ключ -
+-- id задачі Browse AI): паралельні аудити не перезаписують записи один одного,
+-- зміщення оновлюється одним UPDATE. Записи, старші за 30 днів, прибирає наступний Put
+CREATE TABLE IF NOT EXISTS audit_registry (
+  run_id            text PRIMARY KEY,
+  domain            text NOT NULL,
+  spreadsheet_id    text NOT NULL,
+  spreadsheet_name  text,
+  sheet_ids         jsonb NOT NULL DEFAULT '{}',
+  tenant            text NOT NULL DEFAULT 'default',
+  offsets           jsonb NOT NULL DEFAULT '{}',   -- наступний вільний рядок листа (0-based)
+  status            text NOT NULL,                 -- created | callback | full
+  created_at        timestamptz NOT NULL DEFAULT now(),
+  updated_at        timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS audit_registry_domain ON audit_registry (domain, created_at);
+
+-- ---------- Rate Limiter (sub-workflow Rate Limiter) ----------
+-- Token bucket на API, спільний для всіх воркфлоу і воркерів: кожен виклик API
+-- списує cost одним UPDATE (поповнення + резерв), баланс може піти в мінус -
+-- тоді виклик чекає, поки бакет поповниться
+CREATE TABLE IF NOT EXISTS rate_buckets (
+  api             text PRIMARY KEY,
+  capacity        numeric NOT NULL,   -- макс. запитів підряд
+  refill_per_sec  numeric NOT NULL,   -- поповнення, токенів за секунду
+  tokens          numeric NOT NULL,
+  updated_at      timestamptz NOT NULL DEFAULT now()
+);
+
+-- Бюджети API; повторний запуск оновлює лише capacity / refill_per_sec
+INSERT INTO rate_buckets (api, capacity, refill_per_sec, tokens) VALUES
+  ('ahrefs',           60, 1,     60),  -- Ahrefs MCP ~60 req/хв
+  ('sheets_write',     60, 1,     60),  -- Sheets API: 60 write req/хв на користувача
+  ('serpstat',          1, 1.0/3,  1),  -- Serpstat: 1 запит / 3 сек
+  ('google_ads_ideas',  5, 1,      5)   -- generateKeywordIdeas: ліміт на developer token
+ON CONFLICT (api) DO UPDATE
+SET capacity = EXCLUDED.capacity, refill_per_sec = EXCLUDED.refill_per_sec;
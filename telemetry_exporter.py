@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Export n8n execution telemetry: per-node latency, payload size, external calls and API credits.
+
+Приклад:
+    N8N_API_KEY=... python3 telemetry_exporter.py --base http://localhost:5678 \\
+        --since 24h --traces traces --prom /var/lib/node_exporter/n8n.prom
+    N8N_API_KEY=... python3 telemetry_exporter.py --serve 9464 --interval 60 --traces traces
+
+Дані - з виконань n8n (public API, includeData=true), воркфлоу не змінюються.
+Для кожного запуску вузла: старт/кінець, кількість items на виходах і розмір
+виходу в байтах; для вузлів із зовнішніми викликами - кількість запитів
+і оцінка кредитів/токенів. Результат - JSON-трейс на кожне виконання
+і метрики у форматі Prometheus (textfile для node_exporter або /metrics).
+Лічильники накопичуються у файлі стану, тож кожне виконання рахується один раз.
+Потрібно, щоб n8n зберігав дані успішних виконань (EXECUTIONS_DATA_SAVE_ON_SUCCESS=all).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_workflows import api, parse_ts, repo_workflows
+
+# ── Воркфлоу під наглядом: файл експорту -> коротка мітка для метрик ──
+# Решта *.json воркфлоу репозиторію теж під наглядом, мітка - з назви файлу
+WORKFLOWS = {
+    'Sheet 8 - Traffic Pages Nodes (1).json': 'seo_audit',
+    'Zovnishnya_skladova.json': 'link_profile',
+    'GKP_Universal_System.json': 'gkp',
+    'PageSpeed_Test.json': 'pagespeed',
+    'SEO_Audit_AI_Report.json': 'ai_report',
+    'PDF_Audit_Parser.json': 'pdf_parser',
+    'Analiz_Domenu_Master.json': 'master',
+    'Bulk_Domain_Audit.json': 'bulk_audit',
+    'Audit_Queue.json': 'audit_queue',
+    'Audit_Fetch.json': 'audit_fetch',
+    'Rate_Limiter.json': 'rate_limiter',
+    'Ahrefs_Decode.json': 'ahrefs_decode',
+    'Response_Cache.json': 'response_cache',
+    'Keyword_Warehouse.json': 'keyword_warehouse',
+    'Job_Status_API.json': 'job_status',
+    'Sheet_Templates.json': 'sheet_templates',
+}
+
+# ── Зовнішні API: (регулярка по URL вузла, мітка) - перший збіг ──
+API_BY_URL = [
+    (r'api\.ahrefs\.com', 'ahrefs'),
+    (r'api\.serpstat\.com', 'serpstat'),
+    (r'googleads\.googleapis\.com', 'google_ads'),
+    (r'pagespeedonline', 'pagespeed'),
+    (r'sheets\.googleapis\.com', 'sheets'),
+    (r'docs\.googleapis\.com', 'docs'),
+    (r'googleapis\.com/(drive|upload/drive)', 'drive'),
+    (r'api\.openai\.com', 'openai'),
+    (r'api\.browse\.ai', 'browse_ai'),
+    (r'cloudinary\.com', 'cloudinary'),
+    (r'n8n\.rnd\.webpromo\.tools|\$json\.url', 'internal'),
+]
+
+API_BY_TYPE = {
+    '@n8n/n8n-nodes-langchain.mcpClient': 'ahrefs',
+    '@n8n/n8n-nodes-langchain.openAi': 'openai',
+    'n8n-nodes-base.googleSheets': 'sheets',
+    'n8n-nodes-base.googleDrive': 'drive',
+}
+
+# Оцінка кредитів на один запит: Ahrefs v3 - не менше 50 units, далі ~1 unit на рядок;
+# Serpstat - 1 кредит на рядок результату; решта - квотні API, рахуємо запити.
+# Google Docs/Sheets/Drive - квоти на запити, кредитів не списують
+CREDIT_RULES = {
+    'ahrefs': lambda rows: max(50, rows),
+    'serpstat': lambda rows: max(1, rows),
+    'google_ads': lambda rows: 1,
+    'pagespeed': lambda rows: 1,
+    'browse_ai': lambda rows: 1,
+}
+
+DURATION_BUCKETS = [10, 30, 60, 120, 300, 600, 1200, 1800, 3600]
+MAX_SEEN = 5000
+WAIT_TYPE = 'n8n-nodes-base.wait'
+
+# Стан - не частина репозиторію: за замовч. у каталозі стану користувача (XDG_STATE_HOME)
+DEFAULT_STATE = os.path.join(
+    os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state'),
+    'seo-audit', 'telemetry_state.json')
+
+
+# ── Воркфлоу: вузли, типи, API ──
+def load_workflows(args):
+    """Мітка -> {id, name, nodes: {назва: (тип, api)}}; id без поля в JSON шукаємо в n8n за назвою."""
+    by_name = None
+    result = {}
+    for file, wf in repo_workflows().items():
+        label = WORKFLOWS.get(file) or re.sub(r'[^a-z0-9]+', '_', file[:-len('.json')].lower()).strip('_')
+        wf_id = wf.get('id')
+        if not wf_id:
+            if by_name is None:
+                listing = api(args, 'workflows?limit=250')
+                by_name = {w['name']: w['id'] for w in listing.get('data', [])}
+            wf_id = by_name.get(wf.get('name'))
+        nodes = {n['name']: (n['type'], node_api(n)) for n in wf.get('nodes', [])}
+        result[label] = {'id': wf_id, 'name': wf.get('name'), 'nodes': nodes}
+    return result
+
+
+def node_api(node):
+    if node['type'] in API_BY_TYPE:
+        return API_BY_TYPE[node['type']]
+    if node['type'] != 'n8n-nodes-base.httpRequest':
+        return None
+    url = str(node.get('parameters', {}).get('url', ''))
+    for pattern, label in API_BY_URL:
+        if re.search(pattern, url):
+            return label
+    return 'other'
+
+
+# ── Розбір відповідей: рядки результату і токени ──
+def count_rows(value, depth=0):
+    """Рядків у відповіді: MCP content[].text, Serpstat result.data або перший список у JSON."""
+    if depth > 3 or value is None:
+        return 0
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, str):
+        try:
+            return count_rows(json.loads(value), depth + 1)
+        except ValueError:
+            return 0
+    if not isinstance(value, dict):
+        return 0
+    if isinstance(value.get('content'), list) and value['content'] and isinstance(value['content'][0], dict):
+        return count_rows(value['content'][0].get('text'), depth + 1)
+    if isinstance(value.get('result'), dict) and 'data' in value['result']:
+        return count_rows(value['result']['data'], depth + 1)
+    for v in value.values():
+        if isinstance(v, list):
+            return len(v)
+    return 0
+
+
+def count_tokens(j):
+    """Токени з usage (Chat Completions або Responses API); без usage - оцінка len/4 від тексту."""
+    usage = j.get('usage') if isinstance(j, dict) else None
+    if isinstance(usage, dict):
+        prompt = usage.get('prompt_tokens', usage.get('input_tokens', 0)) or 0
+        completion = usage.get('completion_tokens', usage.get('output_tokens', 0)) or 0
+        return prompt, completion, False
+    text = ''
+    if isinstance(j, dict):
+        text = j.get('message', {}).get('content', '') if isinstance(j.get('message'), dict) else j.get('text', '')
+    return 0, len(str(text or '')) // 4, True
+
+
+# ── Трейс одного виконання ──
+def build_trace(label, wf, ex):
+    run_data = ex.get('data', {}).get('resultData', {}).get('runData', {})
+    started = parse_ts(ex.get('startedAt')) * 1000
+    stopped = parse_ts(ex.get('stoppedAt')) * 1000
+    nodes = []
+    totals = {'calls': {}, 'credits': {}, 'tokens': {'prompt': 0, 'completion': 0, 'estimated': False},
+              'bytes': 0, 'items': 0, 'node_ms': 0, 'wait_ms': 0}
+
+    for name, runs in run_data.items():
+        node_type, api_label = wf['nodes'].get(name, (None, None))
+        for i, run in enumerate(runs):
+            outputs = (run.get('data') or {}).get('main') or []
+            items = [item for out in outputs for item in (out or [])]
+            size = len(json.dumps(items, separators=(',', ':'), ensure_ascii=False).encode())
+            ms = run.get('executionTime', 0) or 0
+            start = run.get('startTime') or started
+            entry = {
+                'node': name,
+                'type': node_type,
+                'run': i,
+                'start_ms': round(start - started),
+                'end_ms': round(start - started + ms),
+                'duration_ms': ms,
+                'status': run.get('executionStatus') or ('error' if run.get('error') else 'success'),
+                'items': len(items),
+                'bytes': size,
+            }
+            if api_label:
+                calls = max(1, len((outputs or [[]])[0] or []))
+                entry['api'] = api_label
+                entry['calls'] = calls
+                totals['calls'][api_label] = totals['calls'].get(api_label, 0) + calls
+                if api_label in CREDIT_RULES:
+                    credits = sum(CREDIT_RULES[api_label](count_rows(item.get('json'))) for item in items) or calls
+                    entry['credits'] = credits
+                    totals['credits'][api_label] = totals['credits'].get(api_label, 0) + credits
+                if api_label == 'openai':
+                    prompt = completion = 0
+                    for item in items:
+                        p, c, estimated = count_tokens(item.get('json'))
+                        prompt, completion = prompt + p, completion + c
+                        totals['tokens']['estimated'] |= estimated
+                    entry['tokens'] = {'prompt': prompt, 'completion': completion}
+                    totals['tokens']['prompt'] += prompt
+                    totals['tokens']['completion'] += completion
+            if node_type == WAIT_TYPE:
+                totals['wait_ms'] += ms
+            totals['bytes'] += size
+            totals['items'] += len(items)
+            totals['node_ms'] += ms
+            nodes.append(entry)
+
+    nodes.sort(key=lambda n: (n['start_ms'], n['node']))
+    wall = max(0, stopped - started)
+    return {
+        'execution_id': ex.get('id'),
+        'workflow': label,
+        'workflow_id': wf['id'],
+        'workflow_name': wf['name'],
+        'mode': ex.get('mode'),
+        'status': ex.get('status') or ('success' if ex.get('finished') else 'error'),
+        'started_at': ex.get('startedAt'),
+        'stopped_at': ex.get('stoppedAt'),
+        'wall_ms': round(wall),
+        # Час поза вузлами: черга, відновлення після Wait, накладні витрати n8n
+        'idle_ms': round(max(0, wall - totals['node_ms'])),
+        'totals': totals,
+        'slowest': [n['node'] for n in sorted(nodes, key=lambda n: -n['duration_ms'])[:5]],
+        'nodes': nodes,
+    }
+
+
+# ── Стан і лічильники Prometheus ──
+class Metrics:
+    """Накопичувальні лічильники по всіх оброблених виконаннях; зберігаються у файлі стану."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {'seen': {}, 'counters': {}, 'gauges': {}}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state.update(json.load(f))
+
+    def seen(self, execution_id):
+        return str(execution_id) in self.state['seen']
+
+    def inc(self, metric, labels, value=1):
+        key = json.dumps(labels, sort_keys=True, ensure_ascii=False)
+        bucket = self.state['counters'].setdefault(metric, {})
+        bucket[key] = bucket.get(key, 0) + value
+
+    def set(self, metric, labels, value):
+        key = json.dumps(labels, sort_keys=True, ensure_ascii=False)
+        self.state['gauges'].setdefault(metric, {})[key] = value
+
+    def add_trace(self, trace):
+        with self.lock:
+            wf = trace['workflow']
+            self.inc('n8n_workflow_runs_total', {'workflow': wf, 'status': trace['status']})
+            seconds = trace['wall_ms'] / 1000
+            self.inc('n8n_workflow_duration_seconds_sum', {'workflow': wf}, seconds)
+            self.inc('n8n_workflow_duration_seconds_count', {'workflow': wf})
+            for le in DURATION_BUCKETS + ['+Inf']:
+                hit = le == '+Inf' or seconds <= le
+                self.inc('n8n_workflow_duration_seconds_bucket', {'workflow': wf, 'le': str(le)}, int(hit))
+            self.inc('n8n_workflow_idle_seconds_total', {'workflow': wf}, trace['idle_ms'] / 1000)
+            self.inc('n8n_workflow_wait_seconds_total', {'workflow': wf}, trace['totals']['wait_ms'] / 1000)
+
+            for n in trace['nodes']:
+                labels = {'workflow': wf, 'node': n['node']}
+                self.inc('n8n_node_runs_total', labels)
+                self.inc('n8n_node_duration_seconds_total', labels, n['duration_ms'] / 1000)
+                self.inc('n8n_node_output_items_total', labels, n['items'])
+                self.inc('n8n_node_output_bytes_total', labels, n['bytes'])
+                if n['status'] == 'error':
+                    self.inc('n8n_node_errors_total', labels)
+                if 'api' in n:
+                    self.inc('n8n_external_calls_total', {**labels, 'api': n['api']}, n['calls'])
+                if 'credits' in n:
+                    self.inc('n8n_api_credits_total', {**labels, 'api': n['api']}, n['credits'])
+                for kind, value in n.get('tokens', {}).items():
+                    self.inc('n8n_openai_tokens_total', {**labels, 'kind': kind}, value)
+
+            self.set('n8n_workflow_last_duration_seconds', {'workflow': wf}, seconds)
+            self.set('n8n_workflow_last_run_timestamp_seconds', {'workflow': wf}, parse_ts(trace['stopped_at']))
+
+            self.state['seen'][str(trace['execution_id'])] = parse_ts(trace['stopped_at'])
+            if len(self.state['seen']) > MAX_SEEN:
+                newest = sorted(self.state['seen'].items(), key=lambda kv: -kv[1])[:MAX_SEEN]
+                self.state['seen'] = dict(newest)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def render(self):
+        """Текстовий формат експозиції Prometheus."""
+        lines, typed = [], set()
+        with self.lock:
+            for kind, store in (('counter', self.state['counters']), ('gauge', self.state['gauges'])):
+                for metric in sorted(store):
+                    family = re.sub(r'_(bucket|sum|count)$', '', metric)
+                    if family not in typed:
+                        typed.add(family)
+                        lines.append(f"# TYPE {family} {'histogram' if family != metric else kind}")
+                    for labels, value in sorted(map(lambda kv: (json.loads(kv[0]), kv[1]), store[metric].items()),
+                                                key=series_order):
+                        text = ','.join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+                        lines.append(f'{metric}{{{text}}} {value:.15g}')
+        return '\n'.join(lines) + '\n'
+
+
+def series_order(series):
+    """Серії за мітками; бакети гістограми - за зростанням le, +Inf останнім."""
+    labels = dict(series[0])
+    le = labels.pop('le', None)
+    return sorted(labels.items()), float('inf') if le in (None, '+Inf') else float(le)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ── Збір ──
+def collect(args, workflows, metrics, since_ts):
+    """Нові завершені виконання після since_ts -> трейси + лічильники. Повертає кількість нових."""
+    new = 0
+    for label, wf in workflows.items():
+        if not wf['id']:
+            continue
+        cursor = None
+        while True:
+            path = f"executions?workflowId={wf['id']}&limit=100" + (f'&cursor={cursor}' if cursor else '')
+            listing = api(args, path)
+            items = listing.get('data', [])
+            for item in items:
+                if not item.get('stoppedAt') or metrics.seen(item['id']):
+                    continue
+                if parse_ts(item.get('startedAt')) < since_ts:
+                    continue
+                ex = api(args, f"executions/{item['id']}?includeData=true")
+                trace = build_trace(label, wf, ex)
+                metrics.add_trace(trace)
+                if args.traces:
+                    write_trace(args.traces, trace)
+                new += 1
+                print(f"  {label} #{trace['execution_id']}: {trace['status']}, {trace['wall_ms']} ms, "
+                      f"повільні: {', '.join(trace['slowest'][:3])}")
+            cursor = listing.get('nextCursor')
+            oldest = min((parse_ts(i.get('startedAt')) for i in items), default=0)
+            if not cursor or oldest < since_ts:
+                break
+    metrics.save()
+    if args.prom:
+        tmp = args.prom + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(metrics.render())
+        os.replace(tmp, args.prom)  # node_exporter не побачить напівзаписаний файл
+    return new
+
+
+def write_trace(folder, trace):
+    path = os.path.join(folder, trace['workflow'])
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, f"{trace['execution_id']}.json"), 'w', encoding='utf-8') as f:
+        json.dump(trace, f, ensure_ascii=False, indent=2)
+
+
+def parse_since(value):
+    m = re.fullmatch(r'(\d+)([mhd])', value or '')
+    if not m:
+        raise argparse.ArgumentTypeError('формат: 30m, 6h, 7d')
+    return int(m.group(1)) * {'m': 60, 'h': 3600, 'd': 86400}[m.group(2)]
+
+
+def serve(args, workflows, metrics, window):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, ctype = metrics.render().encode(), 'text/plain; version=0.0.4'
+            elif self.path.startswith('/traces/') and args.traces:
+                execution_id = re.sub(r'\D', '', self.path.rsplit('/', 1)[-1])
+                found = [os.path.join(args.traces, wf, f'{execution_id}.json') for wf in WORKFLOWS.values()]
+                found = [p for p in found if os.path.exists(p)]
+                if not found:
+                    self.send_error(404)
+                    return
+                with open(found[0], 'rb') as f:
+                    body, ctype = f.read(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    def loop():
+        while True:
+            try:
+                collect(args, workflows, metrics, time.time() - window)
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                print(f'  помилка збору: {e}', file=sys.stderr)
+            time.sleep(args.interval)
+
+    threading.Thread(target=loop, daemon=True).start()
+    print(f'Prometheus: http://0.0.0.0:{args.serve}/metrics')
+    ThreadingHTTPServer(('', args.serve), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base', default=os.environ.get('N8N_BASE', 'http://localhost:5678'))
+    parser.add_argument('--api-key', default=os.environ.get('N8N_API_KEY', ''))
+    parser.add_argument('--since', type=parse_since, default=parse_since('24h'), help='вікно виконань: 30m, 6h, 7d')
+    parser.add_argument('--state', default=DEFAULT_STATE,
+                        help='файл стану: оброблені виконання і лічильники (за замовч. %(default)s)')
+    parser.add_argument('--traces', help='папка для JSON-трейсів (traces/<workflow>/<execution_id>.json)')
+    parser.add_argument('--prom', help='textfile з метриками Prometheus (для node_exporter)')
+    parser.add_argument('--serve', type=int, help='порт HTTP /metrics і /traces/<id>; збір у циклі')
+    parser.add_argument('--interval', type=int, default=60, help='секунд між зборами в режимі --serve')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error('потрібен --api-key або N8N_API_KEY (n8n Settings -> API)')
+
+    workflows = load_workflows(args)
+    for label, wf in workflows.items():
+        if not wf['id']:
+            print(f"  {label}: воркфлоу \"{wf['name']}\" не знайдено в n8n - пропускаємо", file=sys.stderr)
+    metrics = Metrics(args.state)
+
+    if args.serve:
+        serve(args, workflows, metrics, args.since)
+        return
+
+    new = collect(args, workflows, metrics, time.time() - args.since)
+    print(f"\nНових виконань: {new} (стан: {args.state}, {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC)")
+
+
+if __name__ == '__main__':
+    main()